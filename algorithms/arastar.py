@@ -0,0 +1,139 @@
+import heapq
+import time
+
+INF = float('inf')
+
+#first heuristic weight and how much it is lowered after every solution
+INITIAL_WEIGHT = 5.0
+WEIGHT_STEP = 1.0
+
+def cost_fn(state, action):
+    return 1  #uniform cost for every move
+
+def ara_star_search(initial_state, goal_test, actions_fn, level_data, heuristics_fn,
+                    initial_weight=INITIAL_WEIGHT, weight_step=WEIGHT_STEP, time_limit=None, node_limit=None,
+                    composition=None, profiler=None, on_solution=None):
+    """
+    Anytime Repairing A* (ARA*): weighted A* ordered by g(n) + w * h(n) that
+    finds a first solution quickly with a large w, then lowers w and keeps
+    improving it, reusing the g values and heuristics computed so far.
+    States whose g improves after being expanded are kept aside
+    (inconsistent) and re-queued when w is lowered, instead of restarting.
+    With w = 1 the search is plain A*, so the last solution is optimal
+    (for consistent heuristics).
+
+    The search stops when w reached 1 or when the time / expansion budget
+    runs out, and returns the best solution found so far.
+
+    :param initial_state: The starting state
+    :param goal_test: goal_test(state) -> bool
+    :param actions_fn: returns (action, next_state) list
+    :param heuristics_fn: list of heuristic_fn(state, level_data) -> float
+    :param initial_weight: first heuristic weight (>= 1)
+    :param weight_step: how much the weight decreases after each solution
+    :param time_limit: wall-clock budget in seconds (None: no limit)
+    :param node_limit: expansion budget (None: no limit)
+    :param composition: composition(values) -> h, see nodes/greedy_node.py (default: sum)
+    :param profiler: optional HeuristicProfiler (heuristics/profiler.py)
+    :param on_solution: optional callback on_solution(actions, weight, elapsed_seconds),
+        called every time a better solution is found
+    :return: (best list of actions or None, expanded nodes, max frontier size)
+    """
+    from nodes.node_pool import NodePool
+    from heuristics.evaluator import HeuristicEvaluator
+
+    start_time = time.perf_counter()
+
+    #nodes are integer handles; a state gets a new handle whenever its g improves
+    nodes = NodePool()
+    evaluator = HeuristicEvaluator(heuristics_fn, level_data, composition=composition, profiler=profiler)
+    root_h, root_cache = evaluator.evaluate_root(initial_state)
+    root = nodes.add(initial_state, g=0.0, h=root_h)
+
+    if goal_test(initial_state):
+        return nodes.reconstruct_path(root), 1, 1
+    if root_h == INF:
+        return None, 0, 1  #some heuristic proved the level unsolvable
+
+    best = {initial_state: root}      #state -> handle with the lowest g so far
+    caches = {initial_state: root_cache}  #heuristic caches of states not expanded yet
+    closed = set()                    #expanded with the current weight
+    inconsistent = {}                 #closed states whose g improved: state -> handle
+
+    weight = max(1.0, initial_weight)
+    frontier = [(weight * root_h, root)]
+    goal = None                       #handle of the cheapest goal reached
+    best_solution = None
+
+    expanded_nodes = 0
+    max_frontier_size = 1
+
+    while True:
+        #improve the current solution with the current weight
+        out_of_budget = False
+        while frontier and (goal is None or frontier[0][0] < nodes.g[goal]):
+            if ((time_limit is not None and time.perf_counter() - start_time > time_limit) or
+                    (node_limit is not None and expanded_nodes >= node_limit)):
+                out_of_budget = True
+                break
+            _, current = heapq.heappop(frontier)
+            current_state = nodes.states[current]
+            if best[current_state] != current or current_state in closed:
+                continue  #stale entry, a cheaper path to this state was found
+            closed.add(current_state)
+            expanded_nodes += 1
+
+            children = []
+            new_states = []
+            for action, next_state in actions_fn(current_state, level_data):
+                new_g = nodes.g[current] + cost_fn(current_state, action)
+                known = best.get(next_state)
+                if known is None:
+                    new_states.append(next_state)
+                    children.append((action, next_state, new_g, None))
+                elif new_g < nodes.g[known]:
+                    children.append((action, next_state, new_g, nodes.h[known]))
+
+            #heuristics are only evaluated for states never seen before; a state
+            #expanded again (after its g improved) evaluates them from scratch
+            evaluated = iter(evaluator.evaluate_children(current_state, caches.pop(current_state, None),
+                                                         new_states))
+            for action, next_state, new_g, h in children:
+                cache = None
+                if h is None:
+                    h, cache = next(evaluated)
+                if h == INF:
+                    if next_state not in best:
+                        best[next_state] = nodes.add(next_state, current, action, new_g, h)
+                    continue  #proven unsolvable
+                child = nodes.add(next_state, current, action, new_g, h)
+                best[next_state] = child
+                if goal_test(next_state):
+                    if goal is None or new_g < nodes.g[goal]:
+                        goal = child
+                elif next_state in closed:
+                    inconsistent[next_state] = child
+                else:
+                    if cache is not None:
+                        caches[next_state] = cache
+                    heapq.heappush(frontier, (new_g + weight * h, child))
+            max_frontier_size = max(max_frontier_size, len(frontier))
+
+        if goal is not None and (best_solution is None or nodes.g[goal] < len(best_solution)):
+            best_solution = nodes.reconstruct_path(goal)
+            if on_solution is not None:
+                on_solution(best_solution, weight, time.perf_counter() - start_time)
+
+        if out_of_budget or weight == 1.0 or (not frontier and not inconsistent):
+            return best_solution, expanded_nodes, max_frontier_size
+
+        #lower the weight, re-queue open and inconsistent states with the new keys
+        weight = max(1.0, weight - weight_step)
+        #only live entries: a stale handle of a state must not hide its current one
+        handles = {nodes.states[handle]: handle for _, handle in frontier
+                   if best[nodes.states[handle]] == handle}
+        handles.update(inconsistent)
+        frontier = [(nodes.g[handle] + weight * nodes.h[handle], handle) for handle in handles.values()]
+        heapq.heapify(frontier)
+        closed.clear()
+        inconsistent.clear()
@@ -1,74 +1,114 @@
-import heapq
+INF = float('inf')
+
+#visited entry of states some heuristic proved unsolvable
+PRUNED = -1
 
 def cost_fn(state, action):
     return 1  #uniform cost for every move
 
-def reconstruct_path(node):
-    path = []
-    while node.parent is not None:
-        path.append(node.action)
-        node = node.parent
-    path.reverse()  # reverse to get path from initial state to goal
-    return path
-
-def a_star_search(initial_state, goal_test, actions_fn, level_data, heuristics_fn):
+def a_star_search(initial_state, goal_test, actions_fn, level_data, heuristics_fn,
+                  batch_heuristics=False, composition=None, profiler=None, open_list="heap", stats=None):
     """
     :param initial_state: The starting state
     :param goal_test: goal_test(state) -> bool
     :param actions_fn: returns (action, next_state) list
     :param cost_fn: cost_fn(state, action) -> float
     :param heuristics_fn: list of heuristic_fn(state) -> float
+    :param batch_heuristics: evaluate all children of an expansion in one
+        vectorized pass (heuristics exposing .batch, see HeuristicEvaluator)
+    :param composition: composition(values) -> h, see nodes/greedy_node.py
+        (default: sum). Children with h = inf are dropped.
+    :param profiler: optional HeuristicProfiler (heuristics/profiler.py) that
+        records per-heuristic statistics and may drop heuristics (adaptive mode)
+    :param open_list: frontier implementation, "heap" (ties by insertion order),
+        "bucket" (ties by lowest h) or "indexed" (decrease-key), see algorithms/open_lists.py
+    :param stats: optional dict, filled with "stale_skipped" (superseded frontier
+        entries popped and dropped) and "decreased" (entries updated in place)
     :return: list of actions from initial_state to goal or None
     """
-    from nodes.astar_node import AStarNode
+    from nodes.node_pool import NodePool
+    from heuristics.evaluator import HeuristicEvaluator
+    from algorithms.open_lists import make_open_list
 
-    #sum of all heuristic functions' results
-    heuristic_values = [h(initial_state, level_data) for h in heuristics_fn]
+    #nodes are integer handles; g(n) and h(n) live in the pool's columns
+    nodes = NodePool()
 
-    #construct initial node
-    root_node = AStarNode(
-        state=initial_state,
-        parent=None,
-        action=None,
-        cost_so_far=0.0,
-        heuristics=heuristic_values
-    )
+    #composed heuristic (sum by default); incremental heuristics keep
+    #their components per frontier node so children are updated from the parent
+    evaluator = HeuristicEvaluator(heuristics_fn, level_data, batch=batch_heuristics,
+                                   composition=composition, profiler=profiler)
+    root_h, root_cache = evaluator.evaluate_root(initial_state)
+    root = nodes.add(initial_state, g=0.0, h=root_h)
+    caches = {root: root_cache}
     
-    if goal_test(root_node.state):
-        return reconstruct_path(root_node)
+    if goal_test(initial_state):
+        return nodes.reconstruct_path(root), 1, 1
+    if root_h == INF:
+        return None, 0, 1  #some heuristic proved the level unsolvable
     
-    #priority queue ordered by f(n) = g(n) + h(n) -- comparison by f(n) defined in AStarNode
-    frontier = []
-    heapq.heappush(frontier, (root_node.f, root_node))
+    #priority queue ordered by f(n) = g(n) + h(n)
+    frontier = make_open_list(open_list)
+    frontier.push(nodes.g[root] + nodes.h[root], nodes.h[root], root)
     
+    #state -> handle of its cheapest path so far; caches holds exactly the
+    #handles still open, so an entry whose handle left it is stale
     visited = dict()  
-    visited[root_node.state] = root_node.cost_so_far
+    visited[initial_state] = root
+    stale = 0          #superseded entries still in the frontier
+    stale_skipped = 0
+    decreased = 0
 
     expanded_nodes = 0
     max_frontier_size = 1
 
     while frontier:
-        _, current_node = heapq.heappop(frontier)
+        current = frontier.pop()
+        if current not in caches:
+            stale -= 1
+            stale_skipped += 1
+            continue  #a cheaper path to this state was queued after it
+        current_state = nodes.states[current]
+        current_cache = caches.pop(current)
         expanded_nodes += 1
 
-        if goal_test(current_node.state):
-            return reconstruct_path(current_node), expanded_nodes, max_frontier_size
+        if goal_test(current_state):
+            _fill_stats(stats, stale_skipped, decreased)
+            return nodes.reconstruct_path(current), expanded_nodes, max_frontier_size
 
         #expand children
-        for action, next_state in actions_fn(current_node.state, level_data):
-            new_g = current_node.cost_so_far + cost_fn(current_node.state, action)
+        children = []
+        for action, next_state in actions_fn(current_state, level_data):
+            new_g = nodes.g[current] + cost_fn(current_state, action)
             #if next_state is new or can be reached cheaper, then push new child
-            if (next_state not in visited) or (new_g < visited[next_state]):
-                visited[next_state] = new_g
-                h_values = [h(next_state, level_data) for h in heuristics_fn]  #apply all heuristics
-                child_node = AStarNode(
-                    state=next_state,
-                    parent=current_node,
-                    action=action,
-                    cost_so_far=new_g,
-                    heuristics=h_values
-                )
-                heapq.heappush(frontier, (child_node.f, child_node))
-        max_frontier_size = max(max_frontier_size, len(frontier))
+            known = visited.get(next_state)
+            if known is None or (known != PRUNED and new_g < nodes.g[known]):
+                children.append((action, next_state, new_g, known))
+
+        #apply all heuristics to every new child at once
+        evaluated = evaluator.evaluate_children(current_state, current_cache,
+                                                [next_state for _, next_state, _, _ in children])
+        for (action, next_state, new_g, known), (h, child_cache) in zip(children, evaluated):
+            if h == INF:
+                visited[next_state] = PRUNED
+                continue  #proven unsolvable: never allocated nor pushed
+            child = nodes.add(next_state, current, action, new_g, h)
+            visited[next_state] = child
+            caches[child] = child_cache
+            if known is not None and known in caches:
+                #the old path is still open: update its entry, or leave it to be skipped
+                del caches[known]
+                if frontier.decrease(known, new_g + h, h, child):
+                    decreased += 1
+                    continue
+                stale += 1
+            frontier.push(new_g + h, h, child)
+        max_frontier_size = max(max_frontier_size, len(frontier) - stale)
 
+    _fill_stats(stats, stale_skipped, decreased)
     return None, expanded_nodes, max_frontier_size
+
+
+def _fill_stats(stats, stale_skipped, decreased):
+    if stats is not None:
+        stats["stale_skipped"] = stale_skipped
+        stats["decreased"] = decreased
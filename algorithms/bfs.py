@@ -7,47 +7,33 @@ def bfs_search(initial_state, goal_test, actions_fn, level_data):
     :param actions_fn: A function actions_fn(state) -> list of (action, next_state)
     :return: list of actions from initial_state to goal, or None if no solution
     """
-    from nodes.bfs_node import BFSNode
+    from nodes.node_pool import NodePool
 
-    root_node = BFSNode(state=initial_state, parent=None, action=None, depth=0)
+    nodes = NodePool()  # nodes are integer handles into parallel columns
+    root = nodes.add(initial_state)
     
-    if goal_test(root_node.state):
-        return reconstruct_path(root_node), 1, 1 #immediate success
+    if goal_test(initial_state):
+        return nodes.reconstruct_path(root), 1, 1 #immediate success
 
-    frontier = deque([root_node])   # FIFO queue
-    visited = set([root_node.state])  # track visited states to avoid repeats
+    frontier = deque([root])   # FIFO queue
+    visited = set([initial_state])  # track visited states to avoid repeats
 
     expanded_nodes = 0  # Tracks how many nodes we expand
     max_frontier_size = 1  # Tracks peak size of the frontier
 
     while frontier:
-        current_node = frontier.popleft()
+        current = frontier.popleft()
         expanded_nodes += 1  
+        depth = nodes.g[current] + 1
 
         # Expand children
-        for action, next_state in actions_fn(current_node.state, level_data):
+        for action, next_state in actions_fn(nodes.states[current], level_data):
             if next_state not in visited:
                 visited.add(next_state)
-                child_node = BFSNode(
-                    state=next_state, 
-                    parent=current_node, 
-                    action=action, 
-                    depth=current_node.depth + 1
-                )
-                if goal_test(child_node.state):
-                    return reconstruct_path(child_node), expanded_nodes, len(frontier)
-                frontier.append(child_node)
+                child = nodes.add(next_state, current, action, depth)
+                if goal_test(next_state):
+                    return nodes.reconstruct_path(child), expanded_nodes, len(frontier)
+                frontier.append(child)
                 max_frontier_size = max(max_frontier_size, len(frontier))
     # No solution found
-    return None
-
-
-def reconstruct_path(node):
-    """
-    Recovers the actions by walking parents up to the root.
-    """
-    actions = []
-    while node.parent is not None:
-        actions.append(node.action)
-        node = node.parent
-    return list(reversed(actions))
+    return None, expanded_nodes, max_frontier_size
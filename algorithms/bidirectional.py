@@ -0,0 +1,104 @@
+from states.sokoban_state import State, get_possible_pulls
+from states.push_moves import reachable_cells
+
+def bidirectional_search(initial_state, goal_test, actions_fn, level_data, pulls_fn=get_possible_pulls):
+    """
+    Bidirectional breadth-first search: forward from initial_state with
+    actions_fn and backward from every goal configuration with pulls_fn
+    (reverse moves), always expanding a whole layer of the smaller frontier.
+    Each side keeps a hash table of the states it reached; when a generated
+    state is already in the other side's table the two halves meet. The
+    shortest meeting of that layer gives an optimal solution, with each side
+    only going about half as deep as BFS.
+
+    Works on State (tuple) states and single-step moves, the same space
+    get_possible_pulls reverses.
+
+    :param initial_state: The starting state
+    :param goal_test: A function goal_test(state) -> bool
+    :param actions_fn: A function actions_fn(state, level_data) -> list of (action, next_state)
+    :param pulls_fn: A function pulls_fn(state, level_data) -> list of (action, previous_state)
+    :return: (list of actions or None, expanded nodes, max size of both frontiers)
+    """
+    from nodes.node_pool import NodePool
+
+    if goal_test(initial_state):
+        return [], 1, 1 #immediate success
+
+    #forward pool: parent = predecessor; backward pool: parent = successor (closer to a goal)
+    forward = NodePool()
+    backward = NodePool()
+    forward_seen = {initial_state: forward.add(initial_state)}
+    backward_seen = {}
+    for state in goal_states(initial_state, level_data):
+        backward_seen[state] = backward.add(state)
+
+    forward_frontier = list(forward_seen.values())
+    backward_frontier = list(backward_seen.values())
+
+    expanded_nodes = 0
+    max_frontier_size = len(forward_frontier) + len(backward_frontier)
+
+    while forward_frontier and backward_frontier:
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            nodes, seen, other_nodes, other_seen = forward, forward_seen, backward, backward_seen
+            frontier, successors = forward_frontier, actions_fn
+        else:
+            nodes, seen, other_nodes, other_seen = backward, backward_seen, forward, forward_seen
+            frontier, successors = backward_frontier, pulls_fn
+
+        best = None  #(cost, handle on this side, handle on the other side)
+        next_frontier = []
+        for current in frontier:
+            expanded_nodes += 1
+            depth = nodes.g[current] + 1
+            for action, next_state in successors(nodes.states[current], level_data):
+                if next_state in seen:
+                    continue
+                child = nodes.add(next_state, current, action, depth)
+                seen[next_state] = child
+                meeting = other_seen.get(next_state)
+                if meeting is not None:
+                    cost = depth + other_nodes.g[meeting]
+                    if best is None or cost < best[0]:
+                        best = (cost, child, meeting)
+                next_frontier.append(child)
+
+        if best is not None:
+            _, handle, other_handle = best
+            forward_handle, backward_handle = (handle, other_handle) if expand_forward else (other_handle, handle)
+            #backward paths are stored goal-first: reverse them to continue the forward half
+            path = forward.reconstruct_path(forward_handle)
+            path.extend(reversed(backward.reconstruct_path(backward_handle)))
+            return path, expanded_nodes, max_frontier_size
+
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+        max_frontier_size = max(max_frontier_size, len(forward_frontier) + len(backward_frontier))
+
+    # No solution found
+    return None, expanded_nodes, max_frontier_size
+
+
+def goal_states(initial_state, level_data):
+    """
+    Every goal configuration: all boxes on goals and the player on any free
+    cell of the area reachable from its starting position (ignoring boxes).
+    Empty if the number of boxes doesn't match the number of goals.
+    """
+    if len(initial_state.box_positions) != len(level_data.goals):
+        return []
+    boxes = level_data.goal_list
+    area = reachable_cells(initial_state.player_pos, set(), level_data)
+    states = []
+    for cell in sorted(area):
+        if cell in level_data.goals:
+            continue
+        zobrist = None
+        if initial_state.zobrist is not None:
+            zobrist = level_data.zobrist_hash(cell, boxes)
+        states.append(State(cell, boxes, zobrist))
+    return states
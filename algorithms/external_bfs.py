@@ -0,0 +1,203 @@
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+
+from states.sokoban_state import State, apply_move, get_possible_pulls
+
+#states sorted in memory before being written to disk as a sorted run
+BUFFER_SIZE = 1 << 18
+#records read at once from a layer / run file
+READ_CHUNK = 1 << 12
+
+def external_bfs_search(initial_state, goal_test, actions_fn, level_data, buffer_size=BUFFER_SIZE,
+                        directory=None, pulls_fn=get_possible_pulls):
+    """
+    External-memory breadth-first search: only one layer is read at a time
+    and at most buffer_size generated states are kept in RAM.
+
+    Every state is a fixed-width record (cell ids of the player and of the
+    sorted boxes as big-endian uint16, so byte order is numeric order).
+    The children of the current layer are buffered, deduplicated and
+    written as sorted runs; the runs are then merged and subtracted from the
+    sorted file of every state seen so far (delayed duplicate detection, all
+    streaming), which gives the next layer, itself merged into the seen file.
+
+    Nodes have no parent pointers: once a goal is generated the path is
+    recovered layer by layer, looking up the predecessors of the current
+    state (pulls_fn) in the previous layer file by binary search. Each step
+    is confirmed with apply_move (the plain move rules), not with actions_fn,
+    which may be stateful (e.g. learned deadlock patterns) and reject now a
+    move it generated earlier.
+
+    Works on State (tuple) states and single-step moves, the same space
+    get_possible_pulls reverses.
+
+    :param initial_state: The starting state
+    :param goal_test: A function goal_test(state) -> bool
+    :param actions_fn: A function actions_fn(state, level_data) -> list of (action, next_state)
+    :param buffer_size: generated states kept in memory before writing a run
+    :param directory: where the layer files are created (default: system temp dir);
+        they are removed when the search ends
+    :param pulls_fn: A function pulls_fn(state, level_data) -> list of (action, previous_state)
+    :return: (list of actions or None, expanded nodes, largest layer size)
+    """
+    if goal_test(initial_state):
+        return [], 1, 1 #immediate success
+
+    codec = StateCodec(level_data, len(initial_state.box_positions))
+    workdir = tempfile.mkdtemp(prefix="sokoban_bfs_", dir=directory)
+    try:
+        layers = [os.path.join(workdir, "layer_0.bin")]
+        seen = os.path.join(workdir, "seen_0.bin")
+        _write_records(layers[0], [codec.encode(initial_state)])
+        shutil.copyfile(layers[0], seen)
+
+        expanded_nodes = 0
+        max_frontier_size = 1
+
+        while True:
+            depth = len(layers)
+            runs = []
+            buffer = set()
+            for record in _read_records(layers[-1], codec.width):
+                state = codec.decode(record)
+                expanded_nodes += 1
+                for action, next_state in actions_fn(state, level_data):
+                    if goal_test(next_state):
+                        path = _recover_path(state, layers, codec, level_data, pulls_fn)
+                        return path + [action], expanded_nodes, max_frontier_size
+                    buffer.add(codec.encode(next_state))
+                    if len(buffer) >= buffer_size:
+                        runs.append(_write_run(workdir, depth, len(runs), buffer))
+                        buffer = set()
+            if buffer:
+                runs.append(_write_run(workdir, depth, len(runs), buffer))
+            if not runs:
+                return None, expanded_nodes, max_frontier_size
+
+            #next layer = merged runs minus every state seen so far
+            candidates = _unique(heapq.merge(*[_read_records(run, codec.width) for run in runs]))
+            layer = os.path.join(workdir, f"layer_{depth}.bin")
+            size = _write_records(layer, _difference(candidates, _read_records(seen, codec.width)))
+            for run in runs:
+                os.remove(run)
+            if size == 0:
+                return None, expanded_nodes, max_frontier_size
+            layers.append(layer)
+            max_frontier_size = max(max_frontier_size, size)
+
+            merged = os.path.join(workdir, f"seen_{depth}.bin")
+            _write_records(merged, heapq.merge(_read_records(seen, codec.width),
+                                               _read_records(layer, codec.width)))
+            os.remove(seen)
+            seen = merged
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+class StateCodec:
+    """
+    Fixed-width binary encoding of State: player cell id followed by the
+    box cell ids (already sorted, since floor_cells and box_positions are
+    both sorted by (x, y)), as big-endian uint16.
+    """
+    def __init__(self, level_data, boxes):
+        self.level_data = level_data
+        self.format = struct.Struct(f">{1 + boxes}H")
+        self.width = self.format.size
+
+    def encode(self, state):
+        cell_index = self.level_data.cell_index
+        return self.format.pack(cell_index[state.player_pos], *[cell_index[box] for box in state.box_positions])
+
+    def decode(self, record):
+        floor_cells = self.level_data.floor_cells
+        player, *boxes = self.format.unpack(record)
+        return State(floor_cells[player], [floor_cells[box] for box in boxes])
+
+
+def _recover_path(state, layers, codec, level_data, pulls_fn):
+    """Actions from the root to 'state', which belongs to the last layer."""
+    path = []
+    for depth in range(len(layers) - 2, -1, -1):
+        for action, previous in pulls_fn(state, level_data):
+            if _contains(layers[depth], codec.encode(previous), codec.width) and \
+                    apply_move(previous, action, level_data) == state:
+                path.append(action)
+                state = previous
+                break
+        else:
+            raise RuntimeError(f"No predecessor of {state} in layer {depth}: the layers do not "
+                               f"match the moves reversed by pulls_fn")
+    path.reverse()
+    return path
+
+
+def _write_run(workdir, depth, index, records):
+    path = os.path.join(workdir, f"run_{depth}_{index}.bin")
+    _write_records(path, sorted(records))
+    return path
+
+
+def _write_records(path, records):
+    """Writes a stream of records, returns how many were written."""
+    count = 0
+    chunk = []
+    with open(path, "wb") as file:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == READ_CHUNK:
+                file.write(b"".join(chunk))
+                count += len(chunk)
+                chunk = []
+        file.write(b"".join(chunk))
+        count += len(chunk)
+    return count
+
+
+def _read_records(path, width):
+    with open(path, "rb") as file:
+        while True:
+            data = file.read(width * READ_CHUNK)
+            if not data:
+                return
+            for start in range(0, len(data), width):
+                yield data[start:start + width]
+
+
+def _unique(records):
+    """Drops consecutive repeats of a sorted stream."""
+    previous = None
+    for record in records:
+        if record != previous:
+            yield record
+            previous = record
+
+
+def _difference(records, seen):
+    """Records of a sorted stream that are not in the sorted stream 'seen'."""
+    current = next(seen, None)
+    for record in records:
+        while current is not None and current < record:
+            current = next(seen, None)
+        if record != current:
+            yield record
+
+
+def _contains(path, record, width):
+    """Binary search of a record in a sorted file."""
+    with open(path, "rb") as file:
+        low, high = 0, os.path.getsize(path) // width
+        while low < high:
+            middle = (low + high) // 2
+            file.seek(middle * width)
+            value = file.read(width)
+            if value == record:
+                return True
+            if value < record:
+                low = middle + 1
+            else:
+                high = middle
+    return False
@@ -0,0 +1,115 @@
+#layers kept for duplicate detection: the current one and the previous one
+KEEP_LAYERS = 2
+#states recorded to notice that no new state is reachable (unsolvable levels)
+SEEN_LIMIT = 1 << 18
+
+def frontier_bfs_search(initial_state, goal_test, actions_fn, level_data, keep_layers=KEEP_LAYERS,
+                        max_depth=None):
+    """
+    Frontier breadth-first search: only the last keep_layers depth layers
+    are kept to detect duplicates, and no parent pointers are stored, so
+    memory is proportional to the widest layers instead of every state
+    reached.
+
+    Each frontier state carries a relay: its ancestor in the latest layer
+    whose depth is a power of two (at least half the depth of the goal).
+    Once the goal is generated, the path is rebuilt by divide and conquer:
+    a new search from the root to the relay and one from the relay to the
+    goal, each with its target depth known, so they store the ancestor at
+    exactly half that depth, and so on until single moves remain.
+
+    A state reached again after its layer was dropped is expanded again.
+    That only costs time (moves that undo each other are caught by the
+    previous layer) and never makes a path longer: layer d still holds
+    every state at distance d, so the solution stays optimal. On an
+    unsolvable level with long cycles the layers may never run out, so
+    while they fit in SEEN_LIMIT every state is also recorded, and the
+    search gives up on a layer made only of states seen before (their
+    successors were all generated already). Past that limit only max_depth
+    stops it.
+
+    :param initial_state: The starting state
+    :param goal_test: A function goal_test(state) -> bool
+    :param actions_fn: A function actions_fn(state, level_data) -> list of (action, next_state)
+    :param keep_layers: previous layers (including the current one) kept for duplicate detection
+    :param max_depth: give up beyond this depth (None: until no new state is reached)
+    :return: (list of actions or None, expanded nodes including the path
+        recovery searches, max number of states kept at once)
+    """
+    if goal_test(initial_state):
+        return [], 1, 1 #immediate success
+
+    stats = [0, 1]  #expanded nodes, max states kept
+    found = _layered_search(initial_state, goal_test, actions_fn, level_data, keep_layers, max_depth,
+                            _power_of_two, stats, SEEN_LIMIT)
+    if found is None:
+        return None, stats[0], stats[1]
+    goal, depth, relay, relay_depth = found
+    path = (_recover(initial_state, relay, relay_depth, actions_fn, level_data, keep_layers, stats) +
+            _recover(relay, goal, depth - relay_depth, actions_fn, level_data, keep_layers, stats))
+    return path, stats[0], stats[1]
+
+
+def _layered_search(start, goal_test, actions_fn, level_data, keep_layers, max_depth, is_relay_depth, stats,
+                    seen_limit=0):
+    """
+    Breadth-first search keeping keep_layers layers. Each layer maps
+    state -> relay (the ancestor in the last layer whose depth passed
+    is_relay_depth, or the root). Returns (goal state, depth, relay, relay
+    depth) or None, also when a layer only holds states seen before (while
+    at most seen_limit states were recorded).
+    """
+    layers = [{start: start}]  #oldest first, the last one is the current frontier
+    seen = {start} if seen_limit else None
+    relay_depth = 0
+    depth = 0
+    while layers[-1] and (max_depth is None or depth < max_depth):
+        depth += 1
+        child_is_relay = is_relay_depth(depth)
+        next_layer = {}
+        for state, relay in layers[-1].items():
+            stats[0] += 1
+            for action, next_state in actions_fn(state, level_data):
+                if next_state in next_layer or any(next_state in layer for layer in layers):
+                    continue
+                if goal_test(next_state):
+                    if child_is_relay:
+                        return next_state, depth, next_state, depth
+                    return next_state, depth, relay, relay_depth
+                next_layer[next_state] = next_state if child_is_relay else relay
+        if seen is not None:
+            if all(state in seen for state in next_layer):
+                return None  #nothing new: every later layer would repeat earlier ones
+            seen.update(next_layer)
+            if len(seen) > seen_limit:
+                seen = None  #too many states to record, only max_depth stops the search
+        if child_is_relay:
+            relay_depth = depth
+        layers.append(next_layer)
+        if len(layers) > keep_layers:
+            layers.pop(0)
+        stats[1] = max(stats[1], sum(len(layer) for layer in layers))
+    return None
+
+
+def _recover(start, target, depth, actions_fn, level_data, keep_layers, stats):
+    """Actions of a shortest path (of the given depth) from start to target."""
+    if depth == 0:
+        return []
+    if depth == 1:
+        for action, next_state in actions_fn(start, level_data):
+            if next_state == target:
+                return [action]
+        raise RuntimeError(f"No move from {start} reaches {target}")
+    middle = depth // 2
+    found = _layered_search(start, lambda state: state == target, actions_fn, level_data,
+                            keep_layers, depth, lambda d: d == middle, stats)
+    if found is None or found[1] != depth:
+        raise RuntimeError(f"{target} is not {depth} moves away from {start}")
+    _, _, relay, _ = found
+    return (_recover(start, relay, middle, actions_fn, level_data, keep_layers, stats) +
+            _recover(relay, target, depth - middle, actions_fn, level_data, keep_layers, stats))
+
+
+def _power_of_two(depth):
+    return depth & (depth - 1) == 0
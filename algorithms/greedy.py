@@ -1,14 +1,7 @@
-import heapq
+INF = float('inf')
 
-def reconstruct_path(node):
-    path = []
-    while node.parent is not None:
-        path.append(node.action)
-        node = node.parent
-    path.reverse()  # reverse to get path from initial state to goal
-    return path
-
-def greedy_search(initial_state, goal_test, actions_fn, level_data, heuristics_fn):
+def greedy_search(initial_state, goal_test, actions_fn, level_data, heuristics_fn,
+                  batch_heuristics=False, composition=None, profiler=None, open_list="heap"):
     """
     Greedy search that expands nodes in order of lowest composed heuristic.
     
@@ -18,44 +11,68 @@ def greedy_search(initial_state, goal_test, actions_fn, level_data, heuristics_f
       - actions_fn: A function actions_fn(state, level_data) -> list of (action, next_state).
       - level_data: Static data for the level (walls, goals, etc.).
       - heuristics_fn: A list of heuristic functions, each taking (state, level_data) and returning a float.
+      - batch_heuristics: If True, the children of each expansion are evaluated in one
+        vectorized pass (heuristics exposing .batch, see HeuristicEvaluator).
+      - composition: Function composition(values) -> h, see nodes/greedy_node.py (default: sum).
+        Children with h = inf are dropped.
+      - profiler: Optional HeuristicProfiler (heuristics/profiler.py) that records per-heuristic
+        statistics and may drop heuristics (adaptive mode).
+      - open_list: Frontier implementation, "heap" (ties by insertion order) or "bucket"
+        (ties by lowest depth), see algorithms/open_lists.py.
     
     Returns:
       - A list of actions from initial_state to goal, or None if no solution is found.
     """
-    from nodes.greedy_node import GreedyNode
+    from nodes.node_pool import NodePool
+    from heuristics.evaluator import HeuristicEvaluator
+    from algorithms.open_lists import make_open_list
 
-    # Calculate all heuristic values for the initial state.
-    heuristic_values = [h(initial_state, level_data) for h in heuristics_fn]
-    root_node = GreedyNode(state=initial_state, parent=None, action=None, heuristics=heuristic_values)
+    # Nodes are integer handles; the composed heuristic lives in the pool's h column.
+    # Incremental heuristics keep their components per frontier node (see HeuristicEvaluator).
+    nodes = NodePool()
+    evaluator = HeuristicEvaluator(heuristics_fn, level_data, batch=batch_heuristics,
+                                   composition=composition, profiler=profiler)
+    root_h, root_cache = evaluator.evaluate_root(initial_state)
+    root = nodes.add(initial_state, h=root_h)
+    caches = {root: root_cache}
     
-    if goal_test(root_node.state):
-        return reconstruct_path(root_node)
+    if goal_test(initial_state):
+        return nodes.reconstruct_path(root), 1, 1
+    if root_h == INF:
+        return None, 0, 1  # Some heuristic proved the level unsolvable
     
-    # Initialize a tie-breaker counter.
-    counter = 0
-    frontier = []
-    heapq.heappush(frontier, (root_node.composed_heuristic, counter, root_node))
-    counter += 1
-    visited = set([root_node.state])
+    # Ordered by h; the depth (g column) breaks ties in the bucket open list.
+    frontier = make_open_list(open_list)
+    frontier.push(nodes.h[root], 0.0, root)
+    visited = set([initial_state])
 
     expanded_nodes = 0
     max_frontier_size = 1
     
     while frontier:
-        _, _, current_node = heapq.heappop(frontier)
+        current = frontier.pop()
+        current_state = nodes.states[current]
+        current_cache = caches.pop(current)
         expanded_nodes += 1
         
-        if goal_test(current_node.state):
-            return reconstruct_path(current_node), expanded_nodes, max_frontier_size
+        if goal_test(current_state):
+            return nodes.reconstruct_path(current), expanded_nodes, max_frontier_size
         
-        # Expand children using actions_fn(state, level_data)
-        for action, next_state in actions_fn(current_node.state, level_data):
+        # Expand children using actions_fn(state, level_data), then evaluate the new ones together
+        children = []
+        for action, next_state in actions_fn(current_state, level_data):
             if next_state not in visited:
                 visited.add(next_state)
-                h_values = [h(next_state, level_data) for h in heuristics_fn]
-                child_node = GreedyNode(state=next_state, parent=current_node, action=action, heuristics=h_values)
-                heapq.heappush(frontier, (child_node.composed_heuristic, counter, child_node))
-                counter += 1
+                children.append((action, next_state))
+        evaluated = evaluator.evaluate_children(current_state, current_cache,
+                                                [next_state for _, next_state in children])
+        for (action, next_state), (h, child_cache) in zip(children, evaluated):
+            if h == INF:
+                continue  # Proven unsolvable: never allocated nor pushed
+            depth = nodes.g[current] + 1
+            child = nodes.add(next_state, current, action, depth, h)
+            caches[child] = child_cache
+            frontier.push(h, depth, child)
         max_frontier_size = max(max_frontier_size, len(frontier))
                 
     return None, expanded_nodes, max_frontier_size
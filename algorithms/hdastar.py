@@ -0,0 +1,269 @@
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+
+INF = float('inf')
+
+#nodes sent to the same owner are grouped in batches of this size
+BATCH_SIZE = 64
+#expansions between two polls of the inbox (pending batches are flushed too)
+POLL_EVERY = 16
+#seconds between two termination checks of the coordinator
+CHECK_INTERVAL = 0.005
+
+def cost_fn(state, action):
+    return 1  #uniform cost for every move
+
+def hda_star_search(initial_state, goal_test, actions_fn, level_data, heuristics_fn,
+                    workers=None, composition=None):
+    """
+    Hash-distributed A* (HDA*): 'workers' processes, each one owning the
+    states with hash(state) % workers == its index and keeping its own open
+    list, best-g table and node pool. A worker expands its cheapest open
+    node and sends every child to its owner (batched through the owner's
+    multiprocessing queue); the owner drops it if it already reached the
+    state with a lower or equal g, otherwise evaluates the heuristics and
+    queues it.
+
+    Goals are detected when they are generated and only update a shared
+    incumbent (the cheapest solution cost so far). A worker is idle when its
+    open list has nothing with f below the incumbent. The coordinator stops
+    the search when every worker is idle and every batch sent was received
+    (two identical snapshots of the counters around the idle flags), so no
+    open node anywhere can lead to a cheaper solution: with an admissible
+    heuristic the incumbent is optimal. The path is then traced back across
+    the workers' pools.
+
+    Workers are forked (they inherit level_data and the heuristics), and
+    states travel pickled, so only State (tuple) states are supported.
+    If a worker dies (e.g. an exception in a heuristic) the coordinator
+    raises RuntimeError instead of waiting for it.
+
+    :param initial_state: The starting state
+    :param goal_test: goal_test(state) -> bool
+    :param actions_fn: returns (action, next_state) list
+    :param heuristics_fn: list of heuristic_fn(state, level_data) -> float
+    :param workers: number of worker processes (default: one per CPU)
+    :param composition: composition(values) -> h, see nodes/greedy_node.py (default: sum)
+    :return: (list of actions or None, expanded nodes, sum of the workers' max open list sizes)
+    """
+    if goal_test(initial_state):
+        return [], 1, 1
+
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context("fork")
+    shared = {
+        "incumbent": context.Value('d', INF),           #cheapest goal cost found
+        "goal": context.Array('q', [-1, -1], lock=False),  #(worker, handle) of that goal
+        "idle": context.Array('b', [0] * workers, lock=False),
+        "sent": context.Array('q', [0] * workers, lock=False),
+        "received": context.Array('q', [0] * workers, lock=False),
+        "inboxes": [context.Queue() for _ in range(workers)],
+        "results": context.Queue(),
+    }
+    processes = [context.Process(target=_worker,
+                                 args=(index, workers, shared, initial_state, goal_test, actions_fn,
+                                       level_data, heuristics_fn, composition), daemon=True)
+                 for index in range(workers)]
+    for process in processes:
+        process.start()
+
+    try:
+        while not _terminated(shared):
+            _check_workers(processes)
+            time.sleep(CHECK_INTERVAL)
+
+        solution = None
+        owner, handle = shared["goal"]
+        if owner != -1:
+            #follow the parent references back to the root, one worker at a time
+            parts = []
+            while handle != -1:
+                shared["inboxes"][owner].put(("trace", handle))
+                _, actions, owner, handle = _next_result(shared, processes)
+                parts.append(actions)
+            solution = [action for actions in reversed(parts) for action in actions]
+
+        for inbox in shared["inboxes"]:
+            inbox.put(("stop",))
+        expanded_nodes = 0
+        max_frontier_size = 0
+        for _ in processes:
+            _, expanded, max_open = _next_result(shared, processes, stopping=True)
+            expanded_nodes += expanded
+            max_frontier_size += max_open
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    return solution, expanded_nodes, max_frontier_size
+
+
+def _check_workers(processes, stopping=False):
+    """
+    Raises if a worker died: before the stop message any exit is a crash
+    (its counters would stay frozen and the search would never end).
+    """
+    for index, process in enumerate(processes):
+        exitcode = process.exitcode
+        if exitcode is not None and (exitcode != 0 or not stopping):
+            raise RuntimeError(f"HDA* worker {index} exited with code {exitcode}")
+
+
+def _next_result(shared, processes, stopping=False):
+    """Next message of the results queue, checking the workers while waiting."""
+    while True:
+        try:
+            return shared["results"].get(timeout=CHECK_INTERVAL)
+        except queue.Empty:
+            _check_workers(processes, stopping)
+
+
+def _terminated(shared):
+    """
+    True when no worker has work left: the message counters are equal and did
+    not change while every idle flag was read as set (a worker only becomes
+    busy again by receiving a batch, which would show in the counters).
+    """
+    sent, received, idle = shared["sent"], shared["received"], shared["idle"]
+    before = (sum(sent), sum(received))
+    if before[0] != before[1] or not all(idle):
+        return False
+    return (sum(sent), sum(received)) == before
+
+
+def _worker(index, workers, shared, initial_state, goal_test, actions_fn, level_data, heuristics_fn,
+            composition):
+    from nodes.node_pool import NodePool
+    from heuristics.evaluator import HeuristicEvaluator
+
+    incumbent, goal = shared["incumbent"], shared["goal"]
+    idle, sent, received = shared["idle"], shared["sent"], shared["received"]
+    inboxes, inbox, results = shared["inboxes"], shared["inboxes"][index], shared["results"]
+
+    #parents are global ids: handle * workers + owner (-1 for the root)
+    nodes = NodePool()
+    evaluator = HeuristicEvaluator(heuristics_fn, level_data, composition=composition)
+    best = {}        #state -> handle with the lowest g so far
+    caches = {}      #open handle -> heuristic cache for its children
+    frontier = []
+    outgoing = [[] for _ in range(workers)]
+
+    expanded_nodes = 0
+    max_frontier_size = 0
+
+    def insert(state, g, parent, action, h=None, cache=None):
+        known = best.get(state)
+        if known is not None and nodes.g[known] <= g:
+            return  #duplicate: already reached at a lower or equal cost
+        if h is None:
+            if known is not None:
+                h = nodes.h[known]  #same state, same heuristic
+            else:
+                h, cache = evaluator.evaluate(state)
+        if h == INF:
+            return  #proven unsolvable
+        handle = nodes.add(state, parent, action, g, h)
+        best[state] = handle
+        if goal_test(state):
+            with incumbent.get_lock():
+                if g < incumbent.value:
+                    incumbent.value = g
+                    goal[0], goal[1] = index, handle
+            return
+        caches[handle] = cache
+        heapq.heappush(frontier, (g + h, -g, handle))
+
+    def flush():
+        for owner, batch in enumerate(outgoing):
+            if batch:
+                sent[index] += 1
+                inboxes[owner].put(("nodes", batch))
+                outgoing[owner] = []
+
+    def handle_message(message):
+        kind = message[0]
+        if kind == "nodes":
+            idle[index] = 0
+            for state, g, parent, action in message[1]:
+                insert(state, g, parent, action)
+            received[index] += 1
+        elif kind == "trace":
+            handle = message[1]
+            path = []
+            while True:
+                path.append(nodes.action_table[nodes.actions[handle]])
+                parent = nodes.parents[handle]
+                if parent == -1:
+                    results.put(("trace", path[-2::-1], index, -1))  #root action is None
+                    return True
+                owner, handle = parent % workers, parent // workers
+                if owner != index:
+                    results.put(("trace", path[::-1], owner, handle))
+                    return True
+        elif kind == "stop":
+            results.put(("stats", expanded_nodes, max_frontier_size))
+            return False
+        return True
+
+    if hash(initial_state) % workers == index:
+        insert(initial_state, 0.0, -1, None)
+
+    running = True
+    while running:
+        #local work: cheapest open node that can still improve the incumbent
+        while frontier and frontier[0][0] < incumbent.value:
+            _, _, current = heapq.heappop(frontier)
+            current_state = nodes.states[current]
+            if best[current_state] != current:
+                caches.pop(current, None)
+                continue  #stale entry, a cheaper path to this state was found
+            current_cache = caches.pop(current)
+            expanded_nodes += 1
+
+            local = []
+            parent = current * workers + index
+            new_g = nodes.g[current]
+            for action, next_state in actions_fn(current_state, level_data):
+                child_g = new_g + cost_fn(current_state, action)
+                owner = hash(next_state) % workers
+                if owner != index:
+                    batch = outgoing[owner]
+                    batch.append((next_state, child_g, parent, action))
+                    if len(batch) >= BATCH_SIZE:
+                        sent[index] += 1
+                        inboxes[owner].put(("nodes", batch))
+                        outgoing[owner] = []
+                    continue
+                known = best.get(next_state)
+                if known is None or child_g < nodes.g[known]:
+                    local.append((action, next_state, child_g))
+
+            #local children reuse the parent's heuristic cache
+            evaluated = evaluator.evaluate_children(current_state, current_cache,
+                                                    [next_state for _, next_state, _ in local])
+            for (action, next_state, child_g), (h, cache) in zip(local, evaluated):
+                insert(next_state, child_g, parent, action, h, cache)
+            max_frontier_size = max(max_frontier_size, len(frontier))
+
+            if expanded_nodes % POLL_EVERY == 0:
+                flush()
+                try:
+                    while running:
+                        running = handle_message(inbox.get_nowait())
+                except queue.Empty:
+                    pass
+                if not running:
+                    break
+
+        if not running:
+            break
+        #nothing worth expanding: hand over pending children, then wait for work
+        flush()
+        idle[index] = 1
+        running = handle_message(inbox.get())
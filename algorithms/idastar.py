@@ -0,0 +1,168 @@
+import math
+
+INF = float('inf')
+
+#default number of transposition table slots
+TABLE_SIZE = 1 << 18
+
+def cost_fn(state, action):
+    return 1  #uniform cost for every move
+
+class TranspositionTable:
+    """
+    Fixed-size table indexed by hash(state) % size. Each slot keeps one state with:
+      - g: lowest depth at which it was reached in the current iteration
+      - h: best heuristic learned for it (min f found below it, minus g)
+      - iteration: last iteration that stored it
+    Replacement policy: a colliding state takes the slot if the stored one
+    is from an older iteration or was reached at the same depth or deeper
+    (shallow states root bigger subtrees, so they are more worth keeping).
+    """
+    def __init__(self, size=TABLE_SIZE):
+        self.size = size
+        self.states = [None] * size
+        self.g = [0] * size
+        self.h = [0.0] * size
+        self.iterations = [0] * size
+        self.iteration = 0
+        self.replacements = 0
+
+    def new_iteration(self):
+        self.iteration += 1
+
+    def lookup(self, state):
+        """Returns (g reached in this iteration or None, learned h or 0)."""
+        slot = hash(state) % self.size
+        stored = self.states[slot]
+        if stored is None or stored != state:
+            return None, 0.0
+        g = self.g[slot] if self.iterations[slot] == self.iteration else None
+        return g, self.h[slot]
+
+    def store(self, state, g, h):
+        slot = hash(state) % self.size
+        stored = self.states[slot]
+        if stored is not None and stored == state:
+            if self.iterations[slot] != self.iteration or g < self.g[slot]:
+                self.g[slot] = g
+            self.h[slot] = max(self.h[slot], h)
+        elif stored is None or self.iterations[slot] < self.iteration or g <= self.g[slot]:
+            if stored is not None:
+                self.replacements += 1
+            self.states[slot] = state
+            self.g[slot] = g
+            self.h[slot] = h
+        else:
+            return
+        self.iterations[slot] = self.iteration
+
+
+def ida_star_search(initial_state, goal_test, actions_fn, level_data, heuristics_fn,
+                    table_size=TABLE_SIZE, composition=None, profiler=None):
+    """
+    Iterative deepening A*: depth-first searches bounded by f = g + h, the
+    bound growing to the smallest f that exceeded it, until a goal is found.
+    Memory is O(depth * branching + table_size) instead of every generated node.
+
+    Costs are integers, so heuristic values are rounded up (still a lower
+    bound), which avoids iterations that only grow the bound by a fraction.
+    The transposition table prunes states already reached at a lower or equal
+    g in the same iteration and remembers, for every finished subtree, the
+    smallest f found below it; that learned h (never above the real cost)
+    cuts re-expansions in the next iterations.
+
+    Only children not reached yet in the iteration (or reached at a higher g)
+    raise the next bound. That alone does not end an unsolvable level, since
+    the learned h keeps growing around cycles, so while they fit in table_size
+    the expanded states are also recorded, each with whether every child cut
+    by the bound had already been expanded: once that holds for all of them,
+    no other state is reachable and the search gives up.
+
+    :param initial_state: The starting state
+    :param goal_test: goal_test(state) -> bool
+    :param actions_fn: returns (action, next_state) list
+    :param heuristics_fn: list of heuristic_fn(state, level_data) -> float
+    :param table_size: number of transposition table slots
+    :param composition: composition(values) -> h, see nodes/greedy_node.py (default: sum)
+    :param profiler: optional HeuristicProfiler (heuristics/profiler.py)
+    :return: (list of actions or None, expanded nodes, max stack size)
+    """
+    from heuristics.evaluator import HeuristicEvaluator
+
+    evaluator = HeuristicEvaluator(heuristics_fn, level_data, composition=composition, profiler=profiler)
+    root_h, root_cache = evaluator.evaluate_root(initial_state)
+
+    if goal_test(initial_state):
+        return [], 1, 1
+    if root_h == INF:
+        return None, 0, 1  #some heuristic proved the level unsolvable
+
+    table = TranspositionTable(table_size)
+    bound = _round_up(root_h)
+    closed = {}  #expanded state -> no child cut by the bound was unexpanded (None once over table_size)
+    expanded_nodes = 0
+    max_frontier_size = 1
+
+    while True:
+        table.new_iteration()
+        table.store(initial_state, 0, root_h)
+        next_bound = INF
+
+        #each frame: [state, g, cache, action, children, next child index, min f below, closed]
+        stack = [[initial_state, 0, root_cache, None, None, 0, INF, True]]
+        while stack:
+            frame = stack[-1]
+            state, g, cache, _, children, index, _, _ = frame
+
+            if children is None:
+                expanded_nodes += 1
+                moves = actions_fn(state, level_data)
+                evaluated = evaluator.evaluate_children(state, cache, [next_state for _, next_state in moves])
+                #most promising children first, so the last iteration reaches the goal sooner
+                children = [(action, next_state, h, child_cache)
+                            for (action, next_state), (h, child_cache) in zip(moves, evaluated)]
+                children.sort(key=lambda child: child[2])
+                frame[4] = children
+
+            if index == len(children):
+                #subtree finished: learn its h and report its min f to the parent
+                stack.pop()
+                table.store(state, g, frame[6] - g)
+                if closed is not None:
+                    closed[state] = frame[7]
+                    if len(closed) > table.size:
+                        closed = None  #too many states to prove the level unsolvable
+                if stack:
+                    stack[-1][6] = min(stack[-1][6], frame[6])
+                continue
+
+            frame[5] = index + 1
+            action, next_state, h, child_cache = children[index]
+            if h == INF:
+                continue  #proven unsolvable
+            new_g = g + cost_fn(state, action)
+            seen_g, learned_h = table.lookup(next_state)
+            f = new_g + _round_up(max(h, learned_h))
+            if seen_g is not None and seen_g <= new_g:
+                frame[6] = min(frame[6], f)  #already searched from a cheaper path (or on the current one)
+                continue
+            if f > bound:
+                next_bound = min(next_bound, f)
+                frame[6] = min(frame[6], f)
+                if closed is not None and next_state not in closed:
+                    frame[7] = False
+                continue
+            if goal_test(next_state):
+                return [entry[3] for entry in stack[1:]] + [action], expanded_nodes, max_frontier_size
+
+            table.store(next_state, new_g, 0.0)
+            stack.append([next_state, new_g, child_cache, action, None, 0, INF, True])
+            max_frontier_size = max(max_frontier_size, len(stack))
+
+        if next_bound == INF or (closed is not None and all(closed.values())):
+            return None, expanded_nodes, max_frontier_size  #no state left to reach
+        bound = next_bound
+
+
+def _round_up(h):
+    return h if h == INF else math.ceil(h)
@@ -0,0 +1,188 @@
+import heapq
+import sys
+
+#buckets per unit of f: heuristics are halved, so f moves in steps of 1/2
+RESOLUTION = 2
+
+class HeapOpenList:
+    """
+    Binary heap of (priority, handle): O(log n) push/pop, ties broken by
+    insertion order (handles grow monotonically). The tie argument of push
+    is ignored, so results match the plain heapq frontier.
+    """
+    def __init__(self):
+        self.heap = []
+
+    def push(self, priority, tie, handle):
+        heapq.heappush(self.heap, (priority, handle))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[1]
+
+    def decrease(self, old_handle, priority, tie, handle):
+        return False  #entries are not addressable: the caller pushes a duplicate
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class IndexedHeapOpenList:
+    """
+    Binary heap of (priority, handle) that knows where every handle sits, so
+    a cheaper path to a queued state replaces its entry in place
+    (decrease-key) instead of leaving a stale duplicate behind. The frontier
+    then holds at most one entry per state. Sifting runs in Python, so each
+    operation is slower than heapq; it pays off when many states are reached
+    again through cheaper paths.
+    """
+    def __init__(self):
+        self.heap = []
+        self.position = {}   #handle -> index in heap
+
+    def push(self, priority, tie, handle):
+        self.heap.append((priority, handle))
+        self.position[handle] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+
+    def pop(self):
+        heap = self.heap
+        top = heap[0][1]
+        del self.position[top]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self.position[last[1]] = 0
+            self._sift_down(0)
+        return top
+
+    def decrease(self, old_handle, priority, tie, handle):
+        """
+        Replaces old_handle by handle with the new priority. Returns False if
+        old_handle is not queued (the caller pushes handle instead).
+        """
+        index = self.position.pop(old_handle, None)
+        if index is None:
+            return False
+        self.heap[index] = (priority, handle)
+        self.position[handle] = index
+        self._sift_down(self._sift_up(index))
+        return True
+
+    def _sift_up(self, index):
+        heap, position = self.heap, self.position
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[index] = heap[parent]
+            position[heap[index][1]] = index
+            index = parent
+        heap[index] = entry
+        position[entry[1]] = index
+        return index
+
+    def _sift_down(self, index):
+        heap, position = self.heap, self.position
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[index] = heap[child]
+            position[heap[index][1]] = index
+            index = child
+        heap[index] = entry
+        position[entry[1]] = index
+        return index
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class BucketOpenList:
+    """
+    Two-level bucket queue: an array of buckets indexed by the priority
+    (f for A*, h for greedy) scaled by 'resolution', each one an array of
+    LIFO stacks indexed by the tie-breaker (h for A*, g for greedy) scaled
+    the same way. A cursor per level remembers the lowest non-empty index,
+    so push is O(1) and pop is O(1) amortized while priorities move in small
+    steps, as they do with unit costs.
+
+    Priorities are floored into their bucket. Values that are not multiples
+    of 1/resolution (e.g. euclidean) are only ordered up to the bucket, but
+    A* stays optimal: goals have integer f, and every f below an integer
+    falls in a lower bucket.
+    """
+    def __init__(self, resolution=RESOLUTION):
+        self.resolution = resolution
+        self.stacks = []     #priority key -> list of stacks (tie key -> handles)
+        self.counts = []     #priority key -> handles in that bucket
+        self.tie_min = []    #priority key -> lower bound of its lowest non-empty tie key
+        self.min_key = sys.maxsize
+        self.size = 0
+
+    def push(self, priority, tie, handle):
+        key = int(priority * self.resolution)
+        tie_key = int(tie * self.resolution)
+        if key >= len(self.stacks):
+            grow = key + 1 - len(self.stacks)
+            self.stacks.extend([] for _ in range(grow))
+            self.counts.extend([0] * grow)
+            self.tie_min.extend([sys.maxsize] * grow)
+        stacks = self.stacks[key]
+        if tie_key >= len(stacks):
+            stacks.extend([] for _ in range(tie_key + 1 - len(stacks)))
+        stacks[tie_key].append(handle)
+        self.counts[key] += 1
+        if tie_key < self.tie_min[key]:
+            self.tie_min[key] = tie_key
+        if key < self.min_key:
+            self.min_key = key
+        self.size += 1
+
+    def pop(self):
+        counts = self.counts
+        key = self.min_key
+        while counts[key] == 0:
+            key += 1
+        self.min_key = key
+        stacks = self.stacks[key]
+        tie_key = self.tie_min[key]
+        while not stacks[tie_key]:
+            tie_key += 1
+        handle = stacks[tie_key].pop()
+        self.size -= 1
+        counts[key] -= 1
+        if counts[key] == 0:
+            #release the emptied bucket
+            self.stacks[key] = []
+            self.tie_min[key] = sys.maxsize
+        else:
+            self.tie_min[key] = tie_key
+        return handle
+
+    def decrease(self, old_handle, priority, tie, handle):
+        return False  #entries are not addressable: the caller pushes a duplicate
+
+    def __len__(self):
+        return self.size
+
+
+def make_open_list(name):
+    """
+    Open list from the configuration: "heap" (default), "bucket" or "indexed".
+    """
+    name = (name or "heap").lower()
+    if name == "heap":
+        return HeapOpenList()
+    if name == "bucket":
+        return BucketOpenList()
+    if name == "indexed":
+        return IndexedHeapOpenList()
+    raise ValueError(f"Unknown open list '{name}'")
@@ -0,0 +1,26 @@
+import sys
+import time
+
+from loaders.map_loader import load_sokoban_map
+from heuristics.pattern_database import PatternDatabase, PDB_DIR
+
+# Builds (offline) the pattern database tables of the given levels, so that
+# runs using the "pdb" heuristic only have to memory-map them.
+# Usage: python build_pdb.py <size> <level number> [<level number> ...]
+
+def main(size, levels):
+    for level_number in levels:
+        level_file = f"maps/level{level_number}.txt"
+        level_data, _ = load_sokoban_map(level_file)
+        start_time = time.time()
+        database = PatternDatabase.for_level(level_file, level_data, size)
+        end_time = time.time()
+        table_bytes = sum(table.nbytes for table in database.tables.values())
+        print(f"Level {level_number}: groups of up to {database.size} boxes, "
+              f"{table_bytes} bytes in {PDB_DIR}/ ({end_time - start_time:.2f} seconds)")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python build_pdb.py <size> <level number> [<level number> ...]")
+        sys.exit(1)
+    main(int(sys.argv[1]), sys.argv[2:])
@@ -14,6 +14,7 @@ from algorithms.astar import a_star_search
 from heuristics.manhattan import manhattan_heuristic
 from heuristics.deadlock import deadlock_heuristic
 from heuristics.hungarian import hungarian_heuristic
+from heuristics.pattern_database import pdb_heuristic
 from heuristics.euclidean import euclidean_heuristic
 
 NUM_TRIALS = 100  # Number of runs for execution time averaging
@@ -31,6 +32,7 @@ def select_heuristic(name):
         "manhattan": manhattan_heuristic,
         "deadlock": deadlock_heuristic,
         "hungarian": hungarian_heuristic,
+        "pdb": pdb_heuristic,
         "euclidean": euclidean_heuristic
     }.get(name.lower())
 
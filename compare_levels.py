@@ -7,6 +7,7 @@ import sys
 
 from loaders.map_loader import load_sokoban_map
 from states.sokoban_state import apply_move, get_possible_moves
+from states.deadlock_patterns import DeadlockPatternStore
 from algorithms.bfs import bfs_search
 from algorithms.dfs import dfs_search
 from algorithms.greedy import greedy_search
@@ -14,6 +15,7 @@ from algorithms.astar import a_star_search
 from heuristics.manhattan import manhattan_heuristic
 from heuristics.deadlock import deadlock_heuristic
 from heuristics.hungarian import hungarian_heuristic
+from heuristics.pattern_database import pdb_heuristic
 
 def select_algorithm(name):
     return {
@@ -27,16 +29,17 @@ def select_heuristic(name):
     return {
         "manhattan": manhattan_heuristic,
         "deadlock": deadlock_heuristic,
-        "hungarian": hungarian_heuristic
+        "hungarian": hungarian_heuristic,
+        "pdb": pdb_heuristic
     }.get(name.lower())
 
-def run_trial(algorithm, level_data, initial_state, heuristics):
+def run_trial(algorithm, level_data, initial_state, heuristics, actions_fn=get_possible_moves):
     start_time = time.time()
     if heuristics:
         solution, expanded_nodes, frontier_size = algorithm(
             initial_state,
             lambda s: s.is_goal(level_data),
-            get_possible_moves,
+            actions_fn,
             level_data,
             heuristics
         )
@@ -44,7 +47,7 @@ def run_trial(algorithm, level_data, initial_state, heuristics):
         solution, expanded_nodes, frontier_size = algorithm(
             initial_state,
             lambda s: s.is_goal(level_data),
-            get_possible_moves,
+            actions_fn,
             level_data
         )
     end_time = time.time()
@@ -94,7 +97,14 @@ def main(config_file):
         map_file = f"maps/level{level}.txt"
         print(f"Running level {level} using {algorithm_name.upper()} with heuristics [{heuristic_display}]...")
         level_data, initial_state = load_sokoban_map(map_file)
-        metrics = run_trial(algorithm, level_data, initial_state, heuristic_funcs)
+        # Optional deadlock patterns learned by previous runs on this level
+        if config.get("deadlock_patterns"):
+            pattern_store = DeadlockPatternStore.for_level(map_file)
+            metrics = run_trial(algorithm, level_data, initial_state, heuristic_funcs,
+                                pattern_store.wrap(get_possible_moves))
+            pattern_store.save()
+        else:
+            metrics = run_trial(algorithm, level_data, initial_state, heuristic_funcs)
         metrics["level"] = level
         results.append(metrics)
 
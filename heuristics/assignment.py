@@ -0,0 +1,120 @@
+# assignment.py
+import numpy as np
+
+# Finite stand-in for infinite box-to-goal costs (push distances), larger
+# than any real assignment: an optimal cost >= BIG means no finite assignment.
+BIG = 1e9
+
+
+class Assignment:
+    """
+    Optimal box-to-goal assignment that can be repaired incrementally.
+
+    Shortest augmenting path Hungarian algorithm (Jonker-Volgenant style)
+    that keeps the dual potentials u (rows = boxes) and v (columns = goals)
+    and the matching. When one box moves only its row of the cost matrix
+    changes: the row is unmatched, its potential lowered back to a feasible
+    value and a single augmenting path is run, O(n^2) instead of solving
+    from scratch in O(n^3).
+
+    The matrix is padded with zero-cost rows/columns to be square, which
+    gives the same optimum as scipy's rectangular linear_sum_assignment.
+    Instances are never modified once built (move returns a copy), so they
+    can be shared between search nodes and stored in the BoxTermCache.
+    """
+    __slots__ = ("box_ids", "costs", "u", "v", "col_row", "cost")
+
+    def __init__(self, box_ids, costs, u, v, col_row):
+        self.box_ids = box_ids    # cell id of the box on each real row
+        self.costs = costs        # 1-indexed rows of the padded cost matrix
+        self.u = u
+        self.v = v
+        self.col_row = col_row    # col_row[j] = row matched to column j (1-indexed, 0 = free)
+        self.cost = None
+
+    @classmethod
+    def solve(cls, boxes, level_data):
+        """Optimal assignment for 'boxes' from scratch."""
+        box_ids = [level_data.cell_index[box] for box in boxes]
+        size = max(len(box_ids), len(level_data.goal_list))
+        costs = [None] + [_cost_row(box_id, size, level_data) for box_id in box_ids]
+        costs += [[0.0] * (size + 1) for _ in range(size - len(box_ids))]
+        assignment = cls(box_ids, costs, [0.0] * (size + 1), [0.0] * (size + 1), [0] * (size + 1))
+        for row in range(1, size + 1):
+            assignment._augment(row)
+        assignment._update_cost()
+        return assignment
+
+    def move(self, old_cell, new_cell, level_data):
+        """Copy of this assignment after the box on 'old_cell' moved to 'new_cell'."""
+        cell_index = level_data.cell_index
+        box_ids = list(self.box_ids)
+        index = box_ids.index(cell_index[old_cell])
+        box_ids[index] = cell_index[new_cell]
+        row = index + 1
+        size = len(self.u) - 1
+
+        costs = list(self.costs)
+        costs[row] = new_costs = _cost_row(box_ids[index], size, level_data)
+        v = self.v
+        col_row = list(self.col_row)
+        col_row[col_row.index(row, 1)] = 0
+        u = list(self.u)
+        #lowest potential that keeps every reduced cost of the row >= 0
+        u[row] = min(new_costs[j] - v[j] for j in range(1, size + 1))
+
+        assignment = Assignment(box_ids, costs, u, list(v), col_row)
+        assignment._augment(row)
+        assignment._update_cost()
+        return assignment
+
+    def _augment(self, row):
+        """Matches the free 'row' through a shortest augmenting path."""
+        costs, u, v, col_row = self.costs, self.u, self.v, self.col_row
+        size = len(u) - 1
+        min_reduced = [float('inf')] * (size + 1)
+        previous = [0] * (size + 1)
+        used = [False] * (size + 1)
+        col_row[0] = row
+        col = 0
+        while True:
+            used[col] = True
+            current_row = col_row[col]
+            row_costs = costs[current_row]
+            row_potential = u[current_row]
+            delta = float('inf')
+            next_col = 0
+            for j in range(1, size + 1):
+                if not used[j]:
+                    reduced = row_costs[j] - row_potential - v[j]
+                    if reduced < min_reduced[j]:
+                        min_reduced[j] = reduced
+                        previous[j] = col
+                    if min_reduced[j] < delta:
+                        delta = min_reduced[j]
+                        next_col = j
+            for j in range(size + 1):
+                if used[j]:
+                    u[col_row[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_reduced[j] -= delta
+            col = next_col
+            if col_row[col] == 0:
+                break
+        #flip the matching along the path
+        while col:
+            previous_col = previous[col]
+            col_row[col] = col_row[previous_col]
+            col = previous_col
+
+    def _update_cost(self):
+        costs = self.costs
+        total = sum(costs[self.col_row[j]][j] for j in range(1, len(self.col_row)))
+        self.cost = float('inf') if total >= BIG else total
+
+
+def _cost_row(box_id, size, level_data):
+    """1-indexed cost row of a box, padded with zero-cost columns up to 'size'."""
+    row = np.minimum(level_data.box_goal_distances[box_id], BIG).tolist()
+    return [0.0] + row + [0.0] * (size - len(row))
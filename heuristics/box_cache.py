@@ -0,0 +1,62 @@
+# box_cache.py
+from collections import OrderedDict
+
+
+class BoxTermCache:
+    """
+    Bounded LRU memo for heuristic terms that depend only on the boxes
+    (box-to-goal assignment, sum of box distances). Many states share the
+    same boxes and only differ in the player position, so only the cheap
+    player term has to be recomputed for them.
+
+    Keys are (tag, boxes) where tag identifies the heuristic term and boxes
+    is the box tuple (or the bitboard for CompactState, see box_key).
+    Enable it with level_data.box_term_cache = BoxTermCache(maxsize).
+    """
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tag, boxes, compute):
+        """Returns the cached value for (tag, boxes), calling compute() on a miss."""
+        key = (tag, boxes)
+        entries = self.entries
+        value = entries.get(key)
+        if value is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = compute()
+        entries[key] = value
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)  # least recently used
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (f"BoxTermCache(size={len(self.entries)}/{self.maxsize}, "
+                f"hits={self.hits}, misses={self.misses}, hit_rate={rate:.1%})")
+
+
+def box_key(state):
+    """Cheapest hashable key for the boxes of a State or CompactState."""
+    boxes = getattr(state, "boxes", None)
+    return boxes if boxes is not None else state.box_positions
+
+
+def cached_box_term(tag, state, level_data, compute):
+    """compute() memoized through level_data.box_term_cache, if one is set."""
+    cache = level_data.box_term_cache
+    if cache is None:
+        return compute()
+    return cache.get(tag, box_key(state), compute)
@@ -1,4 +1,5 @@
 # heuristics.py
+import numpy as np
 
 def deadlock_heuristic(state, level_data):
     """
@@ -32,3 +33,37 @@ def deadlock_heuristic(state, level_data):
     
     # Si ninguna caja problemática se detecta, no se añade costo extra.
     return 0
+
+
+
+def deadlock_incremental(state, level_data, parent):
+    """
+    Versión incremental (ver heuristics/evaluator.py): el componente es el
+    valor del padre y sólo se revisa la caja que se movió. Una caja en
+    deadlock nunca vuelve a una posición viva, así que si el padre ya era
+    infinito el hijo también lo es.
+    """
+    if parent is None:
+        value = deadlock_heuristic(state, level_data)
+        return value, value
+    _, parent_value, delta = parent
+    if delta is None or parent_value == float('inf'):
+        return parent_value, parent_value
+    new_cell = delta[1]
+    if new_cell not in level_data.goals and level_data.is_deadlock(new_cell[0], new_cell[1]):
+        return float('inf'), float('inf')
+    return 0, 0
+
+
+def deadlock_batch(batch, level_data):
+    """
+    Versión vectorizada sobre un StateBatch (ver heuristics/evaluator.py):
+    infinito para los estados con alguna caja en deadlock fuera de meta.
+    """
+    box_ids = batch.box_ids
+    dead = (level_data.dead_cells[box_ids] & ~level_data.goal_cells[box_ids]).any(axis=1)
+    return np.where(dead, np.inf, 0.0)
+
+
+deadlock_heuristic.incremental = deadlock_incremental
+deadlock_heuristic.batch = deadlock_batch
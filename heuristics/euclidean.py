@@ -2,6 +2,10 @@
 
 import math
 
+import numpy as np
+
+from heuristics.box_cache import cached_box_term
+
 def euclidean_heuristic(state, level_data):
     """
     Euclidean heuristic function for Sokoban.
@@ -23,22 +27,67 @@ def euclidean_heuristic(state, level_data):
     Returns:
       - float: The computed heuristic cost.
     """
-    total_box_distance = 0.0
-    for box in state.box_positions:
-        # Compute Euclidean distance from the box to the closest goal.
-        closest_goal_distance = min(
-            math.hypot(box[0] - goal[0], box[1] - goal[1])
-            for goal in level_data.goals
-        )
-        total_box_distance += closest_goal_distance
+    # Sum of each box's Euclidean distance to its closest goal
+    # (memoized per box configuration when level_data.box_term_cache is set).
+    total_box_distance = cached_box_term("euclidean", state, level_data,
+                                         lambda: _total_box_distance(state, level_data))
 
     # Compute the Euclidean distance from the player to the nearest box.
-    if state.box_positions:
-        player_to_box_distance = min(
-            math.hypot(state.player_pos[0] - box[0], state.player_pos[1] - box[1])
-            for box in state.box_positions
-        )
+    player_to_box_distance = _player_to_box_distance(state, level_data)
+
+    return (total_box_distance + player_to_box_distance) / 2.0
+
+
+def euclidean_incremental(state, level_data, parent):
+    """
+    Incremental version (see heuristics/evaluator.py): the box term is the
+    component, updated with the single box that moved in O(goals).
+    """
+    if parent is None:
+        total_box_distance = cached_box_term("euclidean", state, level_data,
+                                             lambda: _total_box_distance(state, level_data))
     else:
-        player_to_box_distance = 0.0
+        _, total_box_distance, delta = parent
+        if delta is not None:
+            old_cell, new_cell = delta
+            total_box_distance += (_closest_goal_distance(new_cell, level_data)
+                                   - _closest_goal_distance(old_cell, level_data))
+    return (total_box_distance + _player_to_box_distance(state, level_data)) / 2.0, total_box_distance
+
+
+def _total_box_distance(state, level_data):
+    return sum(_closest_goal_distance(box, level_data) for box in state.box_positions)
+
+
+def _closest_goal_distance(box, level_data):
+    return min(math.hypot(box[0] - goal[0], box[1] - goal[1]) for goal in level_data.goals)
+
+
+def _player_to_box_distance(state, level_data):
+    if not state.box_positions or level_data.push_moves:
+        return 0.0  #no boxes left, or costs counted in pushes
+    px, py = state.player_pos
+    return min(math.hypot(px - box[0], py - box[1]) for box in state.box_positions)
+
+
+def euclidean_batch(batch, level_data):
+    """
+    Vectorized version over a StateBatch (see heuristics/evaluator.py).
+    """
+    box_ids = batch.box_ids
+    if box_ids.shape[1] == 0:
+        return np.zeros(len(batch))
+    box_x = level_data.cell_x[box_ids]
+    box_y = level_data.cell_y[box_ids]
+    goal_x = np.array([x for x, _ in level_data.goal_list])
+    goal_y = np.array([y for _, y in level_data.goal_list])
+    total_box_distance = np.hypot(box_x[..., None] - goal_x, box_y[..., None] - goal_y).min(axis=2).sum(axis=1)
+    if level_data.push_moves:
+        return total_box_distance / 2.0
+    player_to_box_distance = np.hypot(box_x - level_data.cell_x[batch.player_ids][:, None],
+                                      box_y - level_data.cell_y[batch.player_ids][:, None]).min(axis=1)
+    return (total_box_distance + player_to_box_distance) / 2.0
+
 
-    return (total_box_distance + player_to_box_distance) / 2.0
\ No newline at end of file
+euclidean_heuristic.incremental = euclidean_incremental
+euclidean_heuristic.batch = euclidean_batch
\ No newline at end of file
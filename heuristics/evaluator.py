@@ -0,0 +1,215 @@
+# evaluator.py
+from time import perf_counter
+
+import numpy as np
+
+from nodes.greedy_node import default_composition
+
+INF = float('inf')
+
+# Number of states whose heuristic evaluation is timed to decide the order
+CALIBRATION = 200
+
+
+class HeuristicEvaluator:
+    """
+    Evaluates the list of heuristics used by greedy_search / a_star_search
+    and composes their values into a single h (see nodes/greedy_node.py for
+    the composition policies: sum, max, weighted).
+
+    Incremental protocol: a heuristic function may expose an attribute
+        h.incremental(state, level_data, parent) -> (value, components)
+    where parent is None (evaluate from scratch) or a tuple
+        (parent_state, parent_components, delta)
+    with delta = None if only the player moved, or (old_cell, new_cell) of
+    the single box that moved. 'components' is whatever the heuristic needs
+    to update its value cheaply for the next child (e.g. the box term).
+    Plain heuristics (no attribute) are simply called as h(state, level_data).
+
+    Batch protocol: a heuristic may also expose
+        h.batch(batch, level_data) -> NumPy array of values
+    where batch is a StateBatch (all children of one expansion stacked as
+    cell-id arrays). With batch=True, evaluate_children uses it for every
+    heuristic that has one (one vectorized pass instead of one Python call
+    per child); the others still go through the scalar/incremental path.
+
+    Short-circuit: the scalar heuristics are evaluated cheapest first (their
+    average time is measured over the first 'calibration' states) and a
+    state stops being evaluated as soon as one of them returns inf, since
+    every composition policy is then inf as well. Such states get h = inf
+    and the searches drop them before allocating a node.
+
+    Profiling: with a HeuristicProfiler (heuristics/profiler.py) every call
+    is timed and every expansion is recorded; in adaptive mode the profiler
+    periodically reorders the heuristics and drops the ones not worth their
+    cost (a dropped heuristic counts as 0 in the composition).
+    """
+    def __init__(self, heuristics_fn, level_data, batch=False, composition=None, calibration=CALIBRATION,
+                 profiler=None):
+        self.heuristics_fn = list(heuristics_fn)
+        self.level_data = level_data
+        self.composition = composition if composition is not None else default_composition
+        self.incremental = [getattr(h, "incremental", None) for h in self.heuristics_fn]
+        self.batch = [getattr(h, "batch", None) if batch else None for h in self.heuristics_fn]
+        self.use_batch = any(fn is not None for fn in self.batch)
+        self.needs_delta = any(inc is not None and fn is None
+                               for inc, fn in zip(self.incremental, self.batch))
+
+        #evaluation order of the scalar heuristics, re-sorted by measured cost
+        self.order = [i for i, fn in enumerate(self.batch) if fn is None]
+        self.active = list(range(len(self.heuristics_fn)))
+        self.profiler = profiler
+        self.calibration = calibration
+        self.total_time = [0.0] * len(self.heuristics_fn)
+        self.calls = [0] * len(self.heuristics_fn)
+        self.pruned = 0
+
+    def evaluate(self, state, parent_state=None, parent_cache=None):
+        """
+        Returns (h, cache): the composed heuristic of 'state' (inf if some
+        heuristic proved it unsolvable) and the cache to pass back as
+        parent_cache when evaluating its children.
+        """
+        return self.evaluate_children(parent_state, parent_cache, [state])[0]
+
+    def evaluate_children(self, parent_state, parent_cache, states):
+        """
+        Evaluates every child of one expansion. Returns a list with one
+        (h, cache) pair per state, in the same order.
+        """
+        results = [self._evaluate_scalar(state, parent_state, parent_cache) for state in states]
+        if self.use_batch:
+            alive = [k for k, (values, _) in enumerate(results) if values is not None]
+            if alive:
+                batch = StateBatch([states[k] for k in alive], self.level_data)
+                for i in self.active:
+                    batch_fn = self.batch[i]
+                    if batch_fn is None:
+                        continue
+                    start = perf_counter()
+                    batch_values = batch_fn(batch, self.level_data).tolist()
+                    if self.profiler is not None:
+                        elapsed = (perf_counter() - start) / len(alive)
+                        for value in batch_values:
+                            self.profiler.record_call(i, elapsed, value)
+                    for k, value in zip(alive, batch_values):
+                        results[k][0][i] = value
+
+        composition = self.composition
+        evaluated = []
+        for values, cache in results:
+            if values is None:
+                evaluated.append((INF, cache))
+                continue
+            h = composition(values)
+            if h == INF:
+                self.pruned += 1
+            evaluated.append((h, cache))
+
+        if self.profiler is not None and parent_state is not None:
+            children_values = [values for (values, _), (h, _) in zip(results, evaluated) if h != INF]
+            if self.profiler.record_expansion(children_values, composition, self.active):
+                order, dropped = self.profiler.review(self.active)
+                if dropped is not None:
+                    self.active.remove(dropped)
+                self.order = [i for i in order if self.batch[i] is None]
+        return evaluated
+
+    def evaluate_root(self, state):
+        """Same as evaluate(state)."""
+        return self.evaluate(state)
+
+    def _evaluate_scalar(self, state, parent_state, parent_cache):
+        """
+        Scalar/incremental heuristics of one state, in cost order. Returns
+        (values, cache), with values = None if it was cut short by an inf.
+        """
+        level_data = self.level_data
+        parent = None
+        if parent_cache is not None and self.needs_delta:
+            delta = box_delta(parent_state, state)
+            if delta is not False:
+                parent = (parent_state, delta)
+
+        profiler = self.profiler
+        timed = self.calibration > 0 or profiler is not None
+        values = [0] * len(self.heuristics_fn)
+        cache = [None] * len(self.heuristics_fn)
+        for i in self.order:
+            if timed:
+                start = perf_counter()
+            incremental = self.incremental[i]
+            if incremental is None:
+                value = self.heuristics_fn[i](state, level_data)
+            else:
+                value, cache[i] = incremental(
+                    state, level_data,
+                    None if parent is None else (parent[0], parent_cache[i], parent[1]))
+            if timed:
+                elapsed = perf_counter() - start
+                self.total_time[i] += elapsed
+                self.calls[i] += 1
+                if profiler is not None:
+                    profiler.record_call(i, elapsed, value)
+            if value == INF:
+                self.pruned += 1
+                values = None
+                break
+            values[i] = value
+
+        if self.calibration > 0:
+            self.calibration -= 1
+            if self.calibration == 0:
+                self.order.sort(key=self.average_time)
+        return values, cache
+
+    def average_time(self, i):
+        """Average evaluation time (seconds) of heuristic i over the timed calls."""
+        return self.total_time[i] / self.calls[i] if self.calls[i] else 0.0
+
+
+class StateBatch:
+    """
+    Several states stacked as NumPy arrays of dense cell ids:
+      - player_ids: shape (k,)
+      - box_ids: shape (k, number of boxes)
+    """
+    def __init__(self, states, level_data):
+        cell_index = level_data.cell_index
+        self.states = states
+        self.player_ids = np.array([cell_index[state.player_pos] for state in states], dtype=np.intp)
+        self.box_ids = np.array([[cell_index[box] for box in state.box_positions] for state in states],
+                                dtype=np.intp).reshape(len(states), -1)
+
+    def __len__(self):
+        return len(self.states)
+
+
+def box_delta(parent_state, state):
+    """
+    Which box moved between parent_state and state:
+      - None if the boxes are the same (only the player moved)
+      - (old_cell, new_cell) if exactly one box moved
+      - False otherwise (the caller must evaluate from scratch)
+    Works for State and CompactState (compared as bitboards).
+    """
+    if hasattr(state, "boxes"):
+        changed = parent_state.boxes ^ state.boxes
+        if not changed:
+            return None
+        old = parent_state.boxes & changed
+        new = state.boxes & changed
+        if old & (old - 1) or new & (new - 1):
+            return False
+        cells = state.level_data.floor_cells
+        return cells[old.bit_length() - 1], cells[new.bit_length() - 1]
+
+    parent_boxes = parent_state.box_positions
+    boxes = state.box_positions
+    if parent_boxes == boxes:
+        return None
+    old = set(parent_boxes).difference(boxes)
+    new = set(boxes).difference(parent_boxes)
+    if len(old) != 1 or len(new) != 1:
+        return False
+    return old.pop(), new.pop()
@@ -1,6 +1,9 @@
 import numpy as np
 from scipy.optimize import linear_sum_assignment
 
+from heuristics.assignment import Assignment
+from heuristics.box_cache import cached_box_term
+
 def hungarian_heuristic(state, level_data):
     """
     Heurística compuesta para Sokoban:
@@ -16,37 +19,116 @@ def hungarian_heuristic(state, level_data):
       - level_data: instancia de LevelData, que tiene:
             level_data.goals: frozenset de posiciones (x, y)
             level_data.get_manhattan_distance(pos1, pos2): retorna la distancia Manhattan entre pos1 y pos2.
+            level_data.get_box_distance(box, goal): costo caja-meta (Manhattan por defecto,
+                o distancia real en empujes con level_data.set_box_distance("push")).
     
     Retorna:
       - Un valor numérico (float) que es la suma del costo óptimo de asignación entre cajas y metas 
         y la distancia mínima del jugador a una caja que aún no esté en meta.
     """
     boxes = list(state.box_positions)
-    goals = list(level_data.goals)
     
     # Si no hay cajas, la heurística es 0.
     if not boxes:
         return 0
 
-    # Construir la matriz de costos:
-    # Cada elemento (i, j) es la distancia Manhattan desde la caja i a la meta j (filas=cajas; columnas=metas)
-    cost_matrix = np.zeros((len(boxes), len(goals)), dtype=float)
-    for i, box in enumerate(boxes):
-        for j, goal in enumerate(goals):
-            cost_matrix[i, j] = level_data.get_manhattan_distance(box, goal)
+    # El costo de asignación sólo depende de las cajas: se memoiza si
+    # level_data.box_term_cache está configurado.
+    assignment_cost = cached_box_term("hungarian", state, level_data,
+                                      lambda: _assignment_cost(boxes, level_data))
+    return (assignment_cost + _player_distance(state, boxes, level_data)) / 2
+
+
+def hungarian_incremental(state, level_data, parent):
+    """
+    Versión incremental (ver heuristics/evaluator.py): el componente guardado
+    es la asignación óptima con sus potenciales duales (heuristics/assignment.py).
+      - Si ninguna caja se movió (la mayoría de los hijos) se reutiliza la del padre.
+      - Si se movió una caja, se repara la asignación del padre en O(n²).
+      - Si no, se resuelve desde cero.
+    Sólo el término del jugador se recalcula siempre.
+    """
+    boxes = state.box_positions
+    if not boxes:
+        return 0, None
+    if parent is not None and parent[2] is None:
+        assignment = parent[1]
+    elif parent is not None:
+        old_cell, new_cell = parent[2]
+        assignment = cached_box_term("hungarian_assignment", state, level_data,
+                                     lambda: parent[1].move(old_cell, new_cell, level_data))
+    else:
+        assignment = cached_box_term("hungarian_assignment", state, level_data,
+                                     lambda: Assignment.solve(boxes, level_data))
+    return (assignment.cost + _player_distance(state, boxes, level_data)) / 2, assignment
+
+
+def _assignment_cost(boxes, level_data):
+    # Matriz de costos (filas=cajas; columnas=metas) tomada con fancy indexing
+    # de la tabla precalculada (celda x meta) de la distancia caja-meta actual
+    box_ids = [level_data.cell_index[box] for box in boxes]
+    cost_matrix = level_data.box_goal_distances[box_ids]
+
+    # Con distancias en empujes una caja puede no llegar a ninguna meta: estado irresoluble
+    if np.isinf(cost_matrix).all(axis=1).any():
+        return float('inf')
 
     # Usar el algoritmo Hungarian para hallar la asignación óptima
     # linear_sum_assignment funciona con matrices rectangulares; 
     # devuelve dos arrays: row_ind y col_ind.
-    row_ind, col_ind = linear_sum_assignment(cost_matrix)
-    assignment_cost = cost_matrix[row_ind, col_ind].sum()
+    try:
+        row_ind, col_ind = linear_sum_assignment(cost_matrix)
+    except ValueError:
+        return float('inf')  # no existe asignación con costo finito
+    return cost_matrix[row_ind, col_ind].sum()
 
+
+def _player_distance(state, boxes, level_data):
+    # Con empujes (level_data.push_moves) el costo son empujes: el término del jugador no cuenta
+    if level_data.push_moves:
+        return 0
     # Calcular la distancia mínima desde el jugador a alguna caja que aún no esté en meta
     boxes_not_on_goal = [box for box in boxes if box not in level_data.goals]
     if boxes_not_on_goal:
-        player_distance = min(level_data.get_manhattan_distance(state.player_pos, box)
-                              for box in boxes_not_on_goal)
-    else:
-        player_distance = 0
+        return min(level_data.get_manhattan_distance(state.player_pos, box)
+                   for box in boxes_not_on_goal)
+    return 0
+
+
+def hungarian_batch(batch, level_data):
+    """
+    Versión vectorizada sobre un StateBatch (ver heuristics/evaluator.py):
+    las matrices de costo de todos los hijos se arman juntas con fancy
+    indexing ((hijos x cajas x metas)); la asignación se resuelve por hijo.
+    """
+    box_ids = batch.box_ids
+    if box_ids.shape[1] == 0:
+        return np.zeros(len(batch))
+    cost_matrices = level_data.box_goal_distances[box_ids]
+    assignment_costs = np.empty(len(batch))
+    for k, cost_matrix in enumerate(cost_matrices):
+        if np.isinf(cost_matrix).all(axis=1).any():
+            assignment_costs[k] = np.inf
+            continue
+        try:
+            row_ind, col_ind = linear_sum_assignment(cost_matrix)
+        except ValueError:
+            assignment_costs[k] = np.inf
+            continue
+        assignment_costs[k] = cost_matrix[row_ind, col_ind].sum()
+
+    if level_data.push_moves:
+        return assignment_costs / 2  # el costo son empujes: sin término del jugador
+    # Distancia del jugador a la caja más cercana que no está en meta (0 si todas lo están)
+    player_distances = (
+        np.abs(level_data.cell_x[box_ids] - level_data.cell_x[batch.player_ids][:, None]) +
+        np.abs(level_data.cell_y[box_ids] - level_data.cell_y[batch.player_ids][:, None])
+    ).astype(float)
+    player_distances[level_data.goal_cells[box_ids]] = np.inf
+    player_distance = player_distances.min(axis=1)
+    player_distance[np.isinf(player_distance)] = 0
+    return (assignment_costs + player_distance) / 2
+
 
-    return (assignment_cost + player_distance) / 2
+hungarian_heuristic.incremental = hungarian_incremental
+hungarian_heuristic.batch = hungarian_batch
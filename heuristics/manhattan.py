@@ -1,3 +1,7 @@
+import numpy as np
+
+from heuristics.box_cache import cached_box_term
+
 def manhattan_heuristic(state, level_data):
     """
     A* heuristic function for Sokoban
@@ -6,26 +10,78 @@ def manhattan_heuristic(state, level_data):
          + Distance from player to the nearest box ] / 2
     
     We must divide by 2 to avoid overestimating the cost
+
+    With push moves (level_data.push_moves) the cost is the number of pushes,
+    which the player term could exceed, so it is left out.
+
+    The box-to-goal term uses level_data.get_nearest_goal_distance, which is the
+    Manhattan distance by default or the true push distance when the level
+    was configured with level_data.set_box_distance("push").
     
     :param state: The current Sokoban state (player position, box positions)
     :param level_data: Static level data (walls, goals, precomputed distances)
     :return: Heuristic cost 
     """
 
-    #calculate box-to-goal distance (sum over all boxes) 
-    total_box_distance = 0
-    
-    for box in state.box_positions:
-        # Find closest goal using precomputed distances
-        closest_goal = min(level_data.goals, key=lambda goal: level_data.get_manhattan_distance(box, goal))
-        total_box_distance += level_data.get_manhattan_distance(box, closest_goal)
+    #calculate box-to-goal distance (sum over all boxes), memoized per box
+    #configuration when level_data.box_term_cache is set
+    total_box_distance = cached_box_term("manhattan", state, level_data,
+                                         lambda: _total_box_distance(state, level_data))
 
     #calculate player-to-closest-box distance 
-    if state.box_positions:
-        closest_box = min(state.box_positions, key=lambda box: level_data.get_manhattan_distance(state.player_pos, box))
-        player_to_box_distance = level_data.get_manhattan_distance(state.player_pos, closest_box)
-    else:
-        player_to_box_distance = 0  #case no boxes left
+    player_to_box_distance = _player_to_box_distance(state, level_data)
 
     #return the total heuristic sum
-    return (total_box_distance + player_to_box_distance) / 2
\ No newline at end of file
+    return (total_box_distance + player_to_box_distance) / 2
+
+
+def manhattan_incremental(state, level_data, parent):
+    """
+    Incremental version (see heuristics/evaluator.py): the box term is kept as
+    the component and updated in O(1) with the single box that moved.
+    Only the player term is recomputed.
+    """
+    if parent is None:
+        total_box_distance = cached_box_term("manhattan", state, level_data,
+                                             lambda: _total_box_distance(state, level_data))
+    else:
+        _, total_box_distance, delta = parent
+        if delta is not None and total_box_distance != float('inf'):
+            old_cell, new_cell = delta
+            total_box_distance += (level_data.get_nearest_goal_distance(new_cell)
+                                   - level_data.get_nearest_goal_distance(old_cell))
+    return (total_box_distance + _player_to_box_distance(state, level_data)) / 2, total_box_distance
+
+
+def _total_box_distance(state, level_data):
+    # Distance to the closest goal, precomputed per cell
+    return sum(level_data.get_nearest_goal_distance(box) for box in state.box_positions)
+
+
+def _player_to_box_distance(state, level_data):
+    if not state.box_positions or level_data.push_moves:
+        return 0  #case no boxes left, or costs counted in pushes
+    px, py = state.player_pos
+    return min(abs(px - bx) + abs(py - by) for bx, by in state.box_positions)
+
+
+def manhattan_batch(batch, level_data):
+    """
+    Vectorized version over a StateBatch (see heuristics/evaluator.py):
+    same values as manhattan_heuristic for every stacked state.
+    """
+    box_ids = batch.box_ids
+    if box_ids.shape[1] == 0:
+        return np.zeros(len(batch))
+    total_box_distance = level_data.nearest_goal_distances[box_ids].sum(axis=1)
+    if level_data.push_moves:
+        return total_box_distance / 2
+    player_to_box_distance = (
+        np.abs(level_data.cell_x[box_ids] - level_data.cell_x[batch.player_ids][:, None]) +
+        np.abs(level_data.cell_y[box_ids] - level_data.cell_y[batch.player_ids][:, None])
+    ).min(axis=1)
+    return (total_box_distance + player_to_box_distance) / 2
+
+
+manhattan_heuristic.incremental = manhattan_incremental
+manhattan_heuristic.batch = manhattan_batch
\ No newline at end of file
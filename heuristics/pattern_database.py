@@ -0,0 +1,150 @@
+# pattern_database.py
+import hashlib
+import os
+from itertools import combinations, permutations
+
+import numpy as np
+
+from heuristics.box_cache import cached_box_term
+
+# Tables are stored next to maps/, one set per level (keyed by file hash)
+PDB_DIR = "pattern_databases"
+
+# Table entries are uint8: distances are capped below UNSOLVABLE
+UNSOLVABLE = 255
+
+
+class PatternDatabase:
+    """
+    Exact push costs for small groups of boxes, computed offline.
+
+    tables[k] holds, for every set of k boxes alone on the board, the minimum
+    number of pushes to bring them onto k distinct goals (UNSOLVABLE if they
+    can't). The player is ignored (it may stand anywhere it fits), so the
+    values never overestimate the real cost of those boxes.
+
+    Tables are indexed by live cell ids (cells that are not dead squares)
+    on every axis, with all the permutations of a group filled in, so a
+    lookup is a single table[i, j(, l)].
+
+    Attributes:
+      - size: largest group size (tables for 1..size are kept)
+      - tables: dict k -> NumPy uint8 array (memory-mapped when loaded from disk)
+      - live_index: per floor cell id, its live cell id (-1 for dead squares)
+    """
+    def __init__(self, level_data, size=2, tables=None):
+        self.size = max(1, min(size, len(level_data.goal_list)))
+        live_cells = [i for i, pos in enumerate(level_data.floor_cells)
+                      if pos not in level_data.deadlocks]
+        self.live_index = np.full(len(level_data.floor_cells), -1, dtype=np.intp)
+        self.live_index[live_cells] = np.arange(len(live_cells))
+        self._live_index_list = self.live_index.tolist()
+        if tables is None:
+            tables = {k: build_table(level_data, k, live_cells) for k in range(1, self.size + 1)}
+        self.tables = tables
+
+    @classmethod
+    def for_level(cls, level_file, level_data, size=2, directory=PDB_DIR):
+        """
+        Tables persisted at <directory>/<sha1 of the level file>_pdb<k>.npy,
+        built and saved first if missing, then memory-mapped.
+        """
+        with open(level_file, "rb") as file:
+            digest = hashlib.sha1(file.read()).hexdigest()
+        database = cls(level_data, size, tables={})
+        for k in range(1, database.size + 1):
+            path = os.path.join(directory, f"{digest}_pdb{k}.npy")
+            if not os.path.exists(path):
+                os.makedirs(directory, exist_ok=True)
+                live_cells = np.flatnonzero(database.live_index >= 0).tolist()
+                np.save(path, build_table(level_data, k, live_cells))
+            database.tables[k] = np.load(path, mmap_mode="r")
+        return database
+
+    def cost(self, boxes, level_data):
+        """
+        Sum of the table costs of disjoint groups of 'size' boxes (the last
+        group may be smaller), taken in (x, y) order so that nearby boxes
+        tend to share a group. Groups are disjoint, so the sum is admissible.
+        """
+        cell_index = level_data.cell_index
+        live_index = self._live_index_list
+        ids = [live_index[cell_index[box]] for box in boxes]
+        if -1 in ids:
+            return float('inf')  # a box on a dead square
+        total = 0
+        for start in range(0, len(ids), self.size):
+            group = tuple(ids[start:start + self.size])
+            value = self.tables[len(group)][group]
+            if value == UNSOLVABLE:
+                return float('inf')
+            total += int(value)
+        return total
+
+
+def build_table(level_data, size, live_cells):
+    """
+    Backward breadth-first search over groups of 'size' boxes: starts from
+    every placement of the group on distinct goals and pulls one box at a
+    time (a box on c is pulled to c + d when c + d and c + 2d are free).
+    """
+    live_count = len(live_cells)
+    live_position = {cell: i for i, cell in enumerate(live_cells)}
+    directions = [level_data.move_table[action] for action in ("UP", "DOWN", "LEFT", "RIGHT")]
+    table = np.full((live_count,) * size, UNSOLVABLE, dtype=np.uint8)
+
+    goal_ids = [level_data.cell_index[goal] for goal in level_data.goal_list]
+    frontier = list(combinations(goal_ids, size))
+    for boxes in frontier:
+        _store(table, boxes, 0, live_position)
+
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for boxes in frontier:
+            for i, box in enumerate(boxes):
+                for neighbour in directions:
+                    box_to = neighbour[box]
+                    if box_to < 0 or box_to in boxes:
+                        continue
+                    player_to = neighbour[box_to]
+                    if player_to < 0 or player_to in boxes:
+                        continue
+                    pulled = tuple(sorted(boxes[:i] + (box_to,) + boxes[i + 1:]))
+                    # pulled boxes never land on dead squares (they reach a goal)
+                    if table[tuple(live_position[cell] for cell in pulled)] == UNSOLVABLE:
+                        _store(table, pulled, min(distance, UNSOLVABLE - 1), live_position)
+                        next_frontier.append(pulled)
+        frontier = next_frontier
+    return table
+
+
+def _store(table, boxes, distance, live_position):
+    for order in permutations(live_position[cell] for cell in boxes):
+        table[order] = distance
+
+
+def pdb_heuristic(state, level_data):
+    """
+    Additive pattern database heuristic: sum of the exact push costs of
+    disjoint groups of boxes (see PatternDatabase), plus the steps the
+    player needs to get next to a box that is not on a goal. Every push is
+    a move, so the value is admissible without dividing by 2.
+
+    Uses level_data.pattern_database; if none was loaded, builds the default
+    tables (groups of 2) in memory on first use.
+    """
+    if not state.box_positions:
+        return 0
+    database = level_data.pattern_database
+    if database is None:
+        database = level_data.pattern_database = PatternDatabase(level_data)
+    pushes = cached_box_term("pdb", state, level_data,
+                             lambda: database.cost(state.box_positions, level_data))
+    if pushes == 0:
+        return 0
+    px, py = state.player_pos
+    walk = min(abs(px - x) + abs(py - y) for x, y in state.box_positions
+               if (x, y) not in level_data.goals)
+    return pushes + walk - 1
@@ -0,0 +1,104 @@
+# profiler.py
+
+# Expansions between two reviews of the adaptive mode
+WINDOW = 500
+
+# A heuristic that changes the best child in fewer expansions than this
+# fraction (and never prunes a state) is not worth its evaluation time
+MIN_DECISIVE = 0.02
+
+
+class HeuristicProfiler:
+    """
+    Online statistics of every heuristic in heuristics_fn, collected by
+    HeuristicEvaluator while greedy_search / a_star_search run:
+      - calls / total_time: how many times it was evaluated and for how long
+      - prunes: how many states it proved unsolvable (returned inf)
+      - decisions: in how many expansions it decided which child goes first,
+        i.e. the best child changes if its value is replaced by 0 (siblings
+        share g, so this is the heap order among them)
+
+    Adaptive mode: every 'window' expansions the evaluation order is rebuilt
+    (cheapest time per pruned state first, heuristics that never prune
+    last) and the most expensive heuristic that neither prunes nor decides
+    in at least 'min_decisive' of the expansions is dropped. One heuristic
+    is dropped per review and the last one is always kept.
+    """
+    def __init__(self, names, adaptive=False, window=WINDOW, min_decisive=MIN_DECISIVE):
+        self.names = list(names)
+        self.adaptive = adaptive
+        self.window = window
+        self.min_decisive = min_decisive
+        count = len(self.names)
+        self.calls = [0] * count
+        self.total_time = [0.0] * count
+        self.prunes = [0] * count
+        self.decisions = [0] * count
+        self.expansions = 0
+        self.dropped = []
+
+    def record_call(self, i, elapsed, value):
+        self.calls[i] += 1
+        self.total_time[i] += elapsed
+        if value == float('inf'):
+            self.prunes[i] += 1
+
+    def record_expansion(self, children_values, composition, active):
+        """
+        children_values: heuristic values of the (not pruned) children of one
+        expansion, in generation order. Returns True when a review is due.
+        """
+        self.expansions += 1
+        if len(children_values) > 1:
+            best = _first_min([composition(values) for values in children_values])
+            for i in active:
+                without = []
+                for values in children_values:
+                    values = list(values)
+                    values[i] = 0
+                    without.append(composition(values))
+                if _first_min(without) != best:
+                    self.decisions[i] += 1
+        return self.adaptive and self.expansions % self.window == 0
+
+    def review(self, active):
+        """
+        Adaptive step: returns (order, dropped) for the 'active' heuristic
+        indices, see the class docstring.
+        """
+        active = list(active)
+        useless = [i for i in active
+                   if self.prunes[i] == 0 and self.decisions[i] < self.min_decisive * self.expansions]
+        dropped = None
+        if useless and len(active) > 1:
+            dropped = max(useless, key=self.average_time)
+            active.remove(dropped)
+            self.dropped.append(dropped)
+
+        def cost_per_prune(i):
+            prune_rate = self.prunes[i] / self.calls[i] if self.calls[i] else 0.0
+            if prune_rate == 0:
+                return (1, self.average_time(i))
+            return (0, self.average_time(i) / prune_rate)
+        return sorted(active, key=cost_per_prune), dropped
+
+    def average_time(self, i):
+        return self.total_time[i] / self.calls[i] if self.calls[i] else 0.0
+
+    def report(self):
+        """One line per heuristic, for the runners' output."""
+        lines = []
+        for i, name in enumerate(self.names):
+            decisive = self.decisions[i] / self.expansions if self.expansions else 0.0
+            status = " (dropped)" if i in self.dropped else ""
+            lines.append(f"{name}: {self.calls[i]} calls, {self.average_time(i) * 1e6:.1f} us/call, "
+                         f"{self.prunes[i]} pruned, decisive in {decisive:.1%} of expansions{status}")
+        return lines
+
+
+def _first_min(values):
+    best = 0
+    for k, value in enumerate(values):
+        if value < values[best]:
+            best = k
+    return best
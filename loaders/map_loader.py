@@ -75,6 +75,8 @@ def load_sokoban_map(file_path):
     from states.sokoban_state import State
 
     level_data = LevelData(walls, goals)
-    initial_state = State(player_pos, boxes)
+    # The initial state carries a Zobrist hash so every successor gets its
+    # hash updated incrementally instead of rehashing the whole tuple.
+    initial_state = State(player_pos, boxes, level_data.zobrist_hash(player_pos, boxes))
 
     return level_data, initial_state
\ No newline at end of file
@@ -6,16 +6,29 @@ import time
 # Example placeholders for BFS, DFS, etc. 
 # (Replace with your actual imports if needed)
 from algorithms.bfs import bfs_search
+from algorithms.external_bfs import external_bfs_search, BUFFER_SIZE
+from algorithms.frontier_bfs import frontier_bfs_search, KEEP_LAYERS
 from algorithms.dfs import dfs_search
 from algorithms.greedy import greedy_search
 from algorithms.astar import a_star_search
+from algorithms.arastar import ara_star_search, INITIAL_WEIGHT, WEIGHT_STEP
+from algorithms.hdastar import hda_star_search
+from algorithms.bidirectional import bidirectional_search
+from algorithms.idastar import ida_star_search, TABLE_SIZE
 
 from loaders.map_loader import load_sokoban_map
 from states.sokoban_state import apply_move, get_possible_moves
+from states.compact_state import encode_state, get_possible_moves_compact
+from states.push_moves import normalize_state, get_push_moves, expand_push_solution
+from states.deadlock_patterns import DeadlockPatternStore
 from heuristics.manhattan import manhattan_heuristic
 from heuristics.deadlock import deadlock_heuristic
 from heuristics.hungarian import hungarian_heuristic
+from heuristics.pattern_database import PatternDatabase, pdb_heuristic
 from heuristics.euclidean import euclidean_heuristic
+from heuristics.box_cache import BoxTermCache
+from heuristics.profiler import HeuristicProfiler
+from nodes.greedy_node import select_composition
 
 # Height (in pixels) reserved at the top for stats
 STATS_BAR_HEIGHT = 60  
@@ -28,7 +41,13 @@ def select_algorithm(name):
         "bfs": bfs_search,
         "dfs": dfs_search,
         "greedy": greedy_search,
-        "astar": a_star_search
+        "astar": a_star_search,
+        "idastar": ida_star_search,
+        "bidirectional": bidirectional_search,
+        "arastar": ara_star_search,
+        "hdastar": hda_star_search,
+        "external_bfs": external_bfs_search,
+        "frontier_bfs": frontier_bfs_search
     }
     return algorithms.get(name.lower())
 
@@ -37,10 +56,23 @@ def select_heuristic(name):
         "manhattan": manhattan_heuristic,
         "deadlock": deadlock_heuristic,
         "hungarian": hungarian_heuristic,
+        "pdb": pdb_heuristic,
         "euclidean": euclidean_heuristic
     }
     return heuristics.get(name.lower())
 
+def anytime_options(config):
+    """ARA* options from the config, printing every improved solution."""
+    def report(solution, weight, elapsed):
+        print(f"🔹 Solution with weight {weight:g}: {len(solution)} steps after {elapsed:.4f} seconds")
+    return {
+        "initial_weight": config.get("initial_weight", INITIAL_WEIGHT),
+        "weight_step": config.get("weight_step", WEIGHT_STEP),
+        "time_limit": config.get("time_limit"),
+        "node_limit": config.get("node_limit"),
+        "on_solution": report
+    }
+
 def load_config(config_file):
     with open(config_file, "r") as file:
         return json.load(file)
@@ -128,6 +160,34 @@ def run_game(config_path):
 
     # Load level => returns (map_data, initial_state)
     level_data, initial_state = load_sokoban_map(level_file)
+    # Box-to-goal cost used by manhattan/hungarian: "manhattan" (default) or "push"
+    level_data.set_box_distance(config.get("box_distance", "manhattan"))
+    # Optional LRU memo of box-only heuristic terms ("heuristic_cache_size": N)
+    if config.get("heuristic_cache_size"):
+        level_data.box_term_cache = BoxTermCache(config["heuristic_cache_size"])
+    # Pattern database tables for "pdb", built once per level and memory-mapped
+    if "pdb" in heur_names:
+        level_data.pattern_database = PatternDatabase.for_level(level_file, level_data, config.get("pdb_size", 2))
+
+    # Optional bit-packed state encoding ("state_encoding": "compact")
+    search_state = initial_state
+    actions_fn = get_possible_moves
+    if config.get("state_encoding") == "compact":
+        search_state = encode_state(initial_state, level_data)
+        actions_fn = get_possible_moves_compact
+
+    # Optional push-level search ("moves": "push"): every action is a box push
+    push_moves = config.get("moves") == "push"
+    if push_moves:
+        search_state = normalize_state(initial_state, level_data)
+        actions_fn = get_push_moves
+        level_data.push_moves = True  # the heuristics drop their player term
+
+    # Optional learned deadlock patterns, persisted per level across runs
+    pattern_store = None
+    if config.get("deadlock_patterns"):
+        pattern_store = DeadlockPatternStore.for_level(level_file)
+        actions_fn = pattern_store.wrap(actions_fn)
 
     # Compute window size: map width & height + STATS_BAR_HEIGHT
     tile_size = 40
@@ -162,23 +222,91 @@ def run_game(config_path):
         print(f"Unknown algorithm '{algo_name}'")
         pygame.quit()
         sys.exit()
+    # The backward half pulls boxes on tuple states, one step at a time
+    if algo_name in ["bidirectional", "external_bfs"] and search_state is not initial_state:
+        print(f"{algo_name} only supports the default state encoding and step moves")
+        pygame.quit()
+        sys.exit()
+    # Worker processes exchange pickled tuple states
+    if algo_name == "hdastar" and config.get("state_encoding") == "compact":
+        print("Parallel A* only supports the default state encoding")
+        pygame.quit()
+        sys.exit()
+    # Push moves are generated on tuple states
+    if push_moves and config.get("state_encoding") == "compact":
+        print("Push moves only support the default state encoding")
+        pygame.quit()
+        sys.exit()
 
     # Track execution time
     start_time = 0
     end_time = 0
 
     # Run the algorithm
+    extra = {}
     if heuristics:
         start_time = time.time()
-        solution, expanded_nodes, frontier_size = algorithm(initial_state, lambda s: s.is_goal(level_data), get_possible_moves, level_data, heuristics)
+        if algo_name == "hdastar":
+            # Hash-distributed A* over "workers" processes (default: one per CPU)
+            extra["workers"] = config.get("workers")
+            extra["composition"] = select_composition(config.get("composition"), config.get("weights"), len(heuristics))
+        elif algo_name in ["astar", "greedy", "idastar", "arastar"]:
+            if algo_name == "idastar":
+                # Transposition table slots ("table_size"), memory stays O(depth + table size)
+                extra["table_size"] = config.get("table_size", TABLE_SIZE)
+            elif algo_name == "arastar":
+                # Anytime search: best solution within "time_limit" seconds / "node_limit" expansions
+                extra.update(anytime_options(config))
+            else:
+                # Optional vectorized evaluation of all children at once ("batch_heuristics": true)
+                extra["batch_heuristics"] = config.get("batch_heuristics", False)
+                # Frontier implementation: "heap" (default) or "bucket" (O(1) push/pop on small integer f)
+                extra["open_list"] = config.get("open_list", "heap")
+                if algo_name == "astar":
+                    # Superseded frontier entries skipped / updated in place ("open_list": "indexed")
+                    extra["stats"] = {}
+            # How heuristic values are combined: "sum" (default), "max" or "weighted" (+ "weights")
+            extra["composition"] = select_composition(config.get("composition"), config.get("weights"), len(heuristics))
+            # Per-heuristic statistics ("profile_heuristics"), optionally acting on them ("adaptive_heuristics")
+            if config.get("profile_heuristics") or config.get("adaptive_heuristics"):
+                extra["profiler"] = HeuristicProfiler(heur_names, adaptive=config.get("adaptive_heuristics", False))
+        solution, expanded_nodes, frontier_size = algorithm(search_state, lambda s: s.is_goal(level_data), actions_fn, level_data, heuristics, **extra)
         end_time = time.time()
     else:
+        if algo_name == "external_bfs":
+            # Layers on disk: "buffer_size" states sorted in memory per run, files under "external_dir"
+            extra["buffer_size"] = config.get("buffer_size", BUFFER_SIZE)
+            extra["directory"] = config.get("external_dir")
+        elif algo_name == "frontier_bfs":
+            # Only the last "keep_layers" layers are kept; "max_depth" optionally caps the depth
+            extra["keep_layers"] = config.get("keep_layers", KEEP_LAYERS)
+            extra["max_depth"] = config.get("max_depth")
         start_time = time.time()
-        solution, expanded_nodes, frontier_size = algorithm(initial_state, lambda s: s.is_goal(level_data), get_possible_moves, level_data)
+        solution, expanded_nodes, frontier_size = algorithm(search_state, lambda s: s.is_goal(level_data), actions_fn, level_data, **extra)
         end_time = time.time()
     
     processing_time = end_time - start_time
 
+    if level_data.box_term_cache is not None:
+        print(f"🔹 Heuristic cache: {level_data.box_term_cache}")
+
+    if extra.get("stats"):
+        print(f"🔹 Stale frontier entries skipped: {extra['stats']['stale_skipped']}, "
+              f"updated in place: {extra['stats']['decreased']}")
+
+    if extra.get("profiler") is not None:
+        for line in extra["profiler"].report():
+            print(f"🔹 Heuristic {line}")
+
+    if pattern_store is not None:
+        pattern_store.save()
+        print(f"🔹 Deadlock patterns: {len(pattern_store.patterns)} known, "
+              f"{pattern_store.learned} learned, {pattern_store.hits} hits")
+
+    # Push-level solutions are rebuilt into single steps for the replay
+    if push_moves and solution is not None:
+        solution = expand_push_solution(initial_state, solution, level_data)
+
     if solution is None:
         print("❌ No solution found!")
         pygame.quit()
@@ -6,15 +6,28 @@ import time
 # Example placeholders for BFS, DFS, etc. 
 # (Replace with your actual imports if needed)
 from algorithms.bfs import bfs_search
+from algorithms.external_bfs import external_bfs_search, BUFFER_SIZE
+from algorithms.frontier_bfs import frontier_bfs_search, KEEP_LAYERS
 from algorithms.dfs import dfs_search
 from algorithms.greedy import greedy_search
 from algorithms.astar import a_star_search
+from algorithms.arastar import ara_star_search, INITIAL_WEIGHT, WEIGHT_STEP
+from algorithms.hdastar import hda_star_search
+from algorithms.bidirectional import bidirectional_search
+from algorithms.idastar import ida_star_search, TABLE_SIZE
 
 from loaders.map_loader import load_sokoban_map
 from states.sokoban_state import apply_move, get_possible_moves
+from states.compact_state import encode_state, get_possible_moves_compact
+from states.push_moves import normalize_state, get_push_moves, expand_push_solution
+from states.deadlock_patterns import DeadlockPatternStore
 from heuristics.manhattan import manhattan_heuristic
 from heuristics.deadlock import deadlock_heuristic
 from heuristics.hungarian import hungarian_heuristic
+from heuristics.pattern_database import PatternDatabase, pdb_heuristic
+from heuristics.box_cache import BoxTermCache
+from heuristics.profiler import HeuristicProfiler
+from nodes.greedy_node import select_composition
 
 # Height (in pixels) reserved at the top for stats
 STATS_BAR_HEIGHT = 60  
@@ -27,15 +40,34 @@ def select_algorithm(name):
         "bfs": bfs_search,
         "dfs": dfs_search,
         "greedy": greedy_search,
-        "astar": a_star_search
+        "astar": a_star_search,
+        "idastar": ida_star_search,
+        "bidirectional": bidirectional_search,
+        "arastar": ara_star_search,
+        "hdastar": hda_star_search,
+        "external_bfs": external_bfs_search,
+        "frontier_bfs": frontier_bfs_search
     }
     return algorithms.get(name.lower())
 
+def anytime_options(config):
+    """ARA* options from the config, printing every improved solution."""
+    def report(solution, weight, elapsed):
+        print(f"🔹 Solution with weight {weight:g}: {len(solution)} steps after {elapsed:.4f} seconds")
+    return {
+        "initial_weight": config.get("initial_weight", INITIAL_WEIGHT),
+        "weight_step": config.get("weight_step", WEIGHT_STEP),
+        "time_limit": config.get("time_limit"),
+        "node_limit": config.get("node_limit"),
+        "on_solution": report
+    }
+
 def select_heuristic(name):
     heuristics = {
         "manhattan": manhattan_heuristic,
         "deadlock": deadlock_heuristic,
-        "hungarian": hungarian_heuristic
+        "hungarian": hungarian_heuristic,
+        "pdb": pdb_heuristic
     }
     return heuristics.get(name.lower())
 
@@ -105,8 +137,26 @@ def run_game(config, simulate=False):
     Args:
         config (dict): Configuration dictionary with keys:
             - level (int): The level number to load.
-            - algorithm (str): The algorithm to use (e.g., "astar", "bfs").
+            - algorithm (str): The algorithm to use (e.g., "astar", "bfs", "idastar", "bidirectional", "arastar", "hdastar", "external_bfs", "frontier_bfs").
             - heuristics (list of str): List of heuristic names (optional).
+            - state_encoding (str): "tuple" (default) or "compact" (optional).
+            - moves (str): "step" (default) or "push" for push-level search (optional).
+            - box_distance (str): "manhattan" (default) or "push" box-to-goal costs (optional).
+            - heuristic_cache_size (int): LRU memo size for box-only heuristic terms (optional).
+            - deadlock_patterns (bool): learn/reuse deadlock patterns stored on disk (optional).
+            - pdb_size (int): box group size of the "pdb" heuristic tables, 2 (default) or 3 (optional).
+            - time_limit / node_limit (number): budget of "arastar", which returns the best solution found (optional).
+            - initial_weight / weight_step (float): heuristic weight schedule of "arastar" (optional).
+            - open_list (str): "heap" (default), "bucket" or "indexed" frontier for "astar" / "greedy" (optional).
+            - workers (int): worker processes of "hdastar" (optional, default one per CPU).
+            - buffer_size (int) / external_dir (str): in-memory run size and layer directory of "external_bfs" (optional).
+            - keep_layers / max_depth (int): layers kept and depth limit of "frontier_bfs" (optional).
+            - table_size (int): transposition table slots for "idastar" (optional).
+            - batch_heuristics (bool): evaluate all children of an expansion in one vectorized pass (optional).
+            - composition (str): "sum" (default), "max" or "weighted" heuristic composition (optional).
+            - weights (list of float): one positive weight per heuristic for "weighted" (optional).
+            - profile_heuristics (bool): print per-heuristic time, prunes and decisiveness (optional).
+            - adaptive_heuristics (bool): also reorder/drop heuristics during the run (optional).
         simulate (bool): Whether to run the graphical simulation.
 
     Returns:
@@ -120,29 +170,114 @@ def run_game(config, simulate=False):
     # Load the level file
     level_file = f"maps/level{level_number}.txt"
     level_data, initial_state = load_sokoban_map(level_file)
+    # Box-to-goal cost used by manhattan/hungarian: "manhattan" (default) or "push"
+    level_data.set_box_distance(config.get("box_distance", "manhattan"))
+    # Optional LRU memo of box-only heuristic terms ("heuristic_cache_size": N)
+    if config.get("heuristic_cache_size"):
+        level_data.box_term_cache = BoxTermCache(config["heuristic_cache_size"])
+    # Pattern database tables for "pdb", built once per level and memory-mapped
+    if "pdb" in heuristics:
+        level_data.pattern_database = PatternDatabase.for_level(level_file, level_data, config.get("pdb_size", 2))
+
+    # Optional bit-packed state encoding
+    search_state = initial_state
+    actions_fn = get_possible_moves
+    if config.get("state_encoding") == "compact":
+        search_state = encode_state(initial_state, level_data)
+        actions_fn = get_possible_moves_compact
+
+    # Optional push-level search ("moves": "push"): every action is a box push
+    push_moves = config.get("moves") == "push"
+    if push_moves:
+        search_state = normalize_state(initial_state, level_data)
+        actions_fn = get_push_moves
+        level_data.push_moves = True  # the heuristics drop their player term
+
+    # Optional learned deadlock patterns, persisted per level across runs
+    pattern_store = None
+    if config.get("deadlock_patterns"):
+        pattern_store = DeadlockPatternStore.for_level(level_file)
+        actions_fn = pattern_store.wrap(actions_fn)
 
     # Select algorithm
     algorithm = select_algorithm(algo_name)
     if not algorithm:
         print(f"Unknown algorithm '{algo_name}'")
         return None, None, None, None
+    # The backward half pulls boxes on tuple states, one step at a time
+    if algo_name in ["bidirectional", "external_bfs"] and search_state is not initial_state:
+        print(f"{algo_name} only supports the default state encoding and step moves")
+        return None, None, None, None
+    # Worker processes exchange pickled tuple states
+    if algo_name == "hdastar" and config.get("state_encoding") == "compact":
+        print("Parallel A* only supports the default state encoding")
+        return None, None, None, None
+    # Push moves are generated on tuple states
+    if push_moves and config.get("state_encoding") == "compact":
+        print("Push moves only support the default state encoding")
+        return None, None, None, None
 
     # Prepare heuristics
     heuristic_functions = [select_heuristic(h) for h in heuristics if select_heuristic(h)]
 
+    # Per-heuristic statistics ("profile_heuristics"), optionally acting on them ("adaptive_heuristics")
+    profiler = None
+    if config.get("profile_heuristics") or config.get("adaptive_heuristics"):
+        profiler = HeuristicProfiler([h for h in heuristics if select_heuristic(h)],
+                                     adaptive=config.get("adaptive_heuristics", False))
+
     # Track execution time
     start_time = time.time()
-    if algo_name in ["astar", "greedy"]:  # Only pass heuristics for A* or Greedy
+    if algo_name in ["astar", "greedy", "idastar", "arastar", "hdastar"]:  # Only pass heuristics for informed searches
+        if algo_name == "hdastar":
+            options = {"workers": config.get("workers")}
+        elif algo_name == "idastar":
+            options = {"table_size": config.get("table_size", TABLE_SIZE), "profiler": profiler}
+        elif algo_name == "arastar":
+            options = dict(anytime_options(config), profiler=profiler)
+        else:
+            options = {"batch_heuristics": config.get("batch_heuristics", False), "profiler": profiler,
+                       "open_list": config.get("open_list", "heap")}
+            if algo_name == "astar":
+                options["stats"] = {}
         solution, expanded_nodes, frontier_size = algorithm(
-            initial_state, lambda s: s.is_goal(level_data), get_possible_moves, level_data, heuristic_functions
+            search_state, lambda s: s.is_goal(level_data), actions_fn, level_data, heuristic_functions,
+            composition=select_composition(config.get("composition"), config.get("weights"),
+                                           len(heuristic_functions)),
+            **options
         )
     else:  # For BFS, DFS, etc., do not pass heuristics
+        options = {}
+        if algo_name == "external_bfs":
+            options = {"buffer_size": config.get("buffer_size", BUFFER_SIZE), "directory": config.get("external_dir")}
+        elif algo_name == "frontier_bfs":
+            options = {"keep_layers": config.get("keep_layers", KEEP_LAYERS), "max_depth": config.get("max_depth")}
         solution, expanded_nodes, frontier_size = algorithm(
-            initial_state, lambda s: s.is_goal(level_data), get_possible_moves, level_data
+            search_state, lambda s: s.is_goal(level_data), actions_fn, level_data, **options
         )
     end_time = time.time()
     processing_time = end_time - start_time
 
+    if level_data.box_term_cache is not None:
+        print(f"🔹 Heuristic cache: {level_data.box_term_cache}")
+
+    if algo_name == "astar":
+        print(f"🔹 Stale frontier entries skipped: {options['stats']['stale_skipped']}, "
+              f"updated in place: {options['stats']['decreased']}")
+
+    if profiler is not None and algo_name in ["astar", "greedy", "idastar", "arastar"]:
+        for line in profiler.report():
+            print(f"🔹 Heuristic {line}")
+
+    if pattern_store is not None:
+        pattern_store.save()
+        print(f"🔹 Deadlock patterns: {len(pattern_store.patterns)} known, "
+              f"{pattern_store.learned} learned, {pattern_store.hits} hits")
+
+    # Push-level solutions are rebuilt into single steps (moves and pushes)
+    if push_moves and solution is not None:
+        solution = expand_push_solution(initial_state, solution, level_data)
+
     if solution is None:
         print("❌ No solution found!")
         return None, expanded_nodes, frontier_size, processing_time
@@ -7,6 +7,53 @@ def default_composition(heuristics):
     """
     return sum(heuristics)
 
+def max_composition(heuristics):
+    """
+    Composición por máximo: sigue siendo admisible si cada heurística lo es.
+    """
+    return max(heuristics, default=0)
+
+def weighted_composition(weights, count=None):
+    """
+    Devuelve una composición que suma los valores heurísticos multiplicados
+    por 'weights' (en el mismo orden que la lista de heurísticas).
+    Los pesos deben ser positivos, para que un valor infinito siga siéndolo.
+    Debe haber un peso por heurística: se valida contra 'count' si se indica
+    y, si no, en la primera llamada.
+    """
+    weights = list(weights)
+    if any(weight <= 0 for weight in weights):
+        raise ValueError("Composition weights must be positive")
+    if count is not None:
+        _check_weight_count(weights, count)
+
+    def composition(heuristics):
+        if len(heuristics) != len(weights):
+            _check_weight_count(weights, len(heuristics))
+        return sum(weight * value for weight, value in zip(weights, heuristics))
+    return composition
+
+def _check_weight_count(weights, count):
+    if len(weights) != count:
+        raise ValueError(f"The 'weighted' composition needs one weight per heuristic "
+                         f"({count}), got {len(weights)}")
+
+def select_composition(name, weights=None, count=None):
+    """
+    Composición a partir de la configuración: "sum" (por defecto), "max" o
+    "weighted" (requiere 'weights', uno por cada una de las 'count' heurísticas).
+    """
+    name = (name or "sum").lower()
+    if name == "sum":
+        return default_composition
+    if name == "max":
+        return max_composition
+    if name == "weighted":
+        if weights is None:
+            raise ValueError("The 'weighted' composition needs a list of weights")
+        return weighted_composition(weights, count)
+    raise ValueError(f"Unknown composition '{name}'")
+
 class GreedyNode(Node):
     """
     Nodo para búsqueda Greedy que ahora acepta múltiples heurísticas.
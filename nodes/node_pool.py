@@ -0,0 +1,57 @@
+# nodes/node_pool.py
+from array import array
+
+
+class NodePool:
+    """
+    Almacén de nodos en columnas paralelas en lugar de un objeto por nodo.
+
+    Cada nodo es un entero (handle) que indexa las columnas:
+      - states: el estado del nodo (referencia, el mismo objeto que está en visited)
+      - parents: handle del nodo padre (-1 para la raíz)
+      - actions: código de la acción que llevó del padre a este nodo
+      - g: costo acumulado g(n) (o profundidad en BFS/DFS)
+      - h: valor heurístico compuesto h(n)
+
+    Las acciones se internan en action_table, así cada nodo guarda solo un
+    código de 2 bytes. Un nodo ocupa ~30 bytes frente a los cientos de bytes
+    de un Node con __dict__.
+    """
+    def __init__(self):
+        self.states = []
+        self.parents = array('i')
+        self.actions = array('H')
+        self.g = array('d')
+        self.h = array('d')
+        self.action_table = [None]  # código 0 = sin acción (raíz)
+        self.action_codes = {}
+
+    def add(self, state, parent=-1, action=None, g=0.0, h=0.0):
+        """Agrega un nodo y devuelve su handle."""
+        code = self.action_codes.get(action)
+        if code is None:
+            if action is None:
+                code = 0
+            else:
+                code = len(self.action_table)
+                self.action_table.append(action)
+                self.action_codes[action] = code
+        self.states.append(state)
+        self.parents.append(parent)
+        self.actions.append(code)
+        self.g.append(g)
+        self.h.append(h)
+        return len(self.states) - 1
+
+    def reconstruct_path(self, handle):
+        """Recupera las acciones recorriendo la columna de padres hasta la raíz."""
+        path = []
+        parents = self.parents
+        while parents[handle] != -1:
+            path.append(self.action_table[self.actions[handle]])
+            handle = parents[handle]
+        path.reverse()
+        return path
+
+    def __len__(self):
+        return len(self.states)
@@ -0,0 +1,182 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+import traceback
+
+from main_analysis import run_game
+
+# Algorithms whose first solution is optimal (with admissible heuristics)
+OPTIMAL_ALGORITHMS = {"bfs", "astar", "idastar", "bidirectional", "hdastar", "frontier_bfs", "external_bfs"}
+# Optimal algorithms that ignore heuristics
+BLIND_ALGORITHMS = {"bfs", "bidirectional", "frontier_bfs", "external_bfs"}
+# Heuristics that only prune (0 or inf), so adding them keeps a sum admissible
+PRUNING_HEURISTICS = {"deadlock"}
+POLICIES = ("first", "optimal")
+
+# Keys of the portfolio file that are not passed to the strategies
+PORTFOLIO_KEYS = ("strategies", "policy", "timeout", "record")
+
+
+def strategy_name(strategy):
+    """e.g. 'astar (hungarian, deadlock)'"""
+    heuristics = strategy.get("heuristics") or []
+    if heuristics:
+        return f"{strategy['algorithm']} ({', '.join(heuristics)})"
+    return strategy["algorithm"]
+
+
+def optimality_problem(config):
+    """
+    Why a strategy config can return a solution that is not step-optimal,
+    or None if its first solution is optimal.
+    """
+    algorithm = config["algorithm"].lower()
+    if algorithm not in OPTIMAL_ALGORITHMS:
+        return "not an optimal algorithm"
+    if config.get("moves") == "push":
+        return "push moves minimize pushes, not steps"
+    if algorithm in BLIND_ALGORITHMS:
+        return None
+    composition = (config.get("composition") or "sum").lower()
+    if composition == "weighted":
+        return "weighted composition is not admissible"
+    estimating = [h for h in config.get("heuristics") or [] if h.lower() not in PRUNING_HEURISTICS]
+    if composition == "sum" and len(estimating) > 1:
+        return "sum of several heuristics is not admissible"
+    return None
+
+
+def _run_strategy(index, config, results):
+    # Own process group, so cancelling also stops the processes it starts (hdastar workers)
+    os.setpgrp()
+    sys.stdout = open(os.devnull, "w")
+    try:
+        solution, expanded_nodes, frontier_size, processing_time = run_game(config, simulate=False)
+    except Exception:
+        # stdout is gone: the traceback travels to the parent with the result
+        results.put((index, None, None, None, None, traceback.format_exc()))
+        return
+    results.put((index, solution, expanded_nodes, frontier_size, processing_time, None))
+
+
+def _cancel(process):
+    if process.is_alive():
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            process.terminate()  # still starting, its group does not exist yet
+    process.join()
+
+
+def run_portfolio(config):
+    """
+    Races several strategies (algorithm + heuristics + options) on the same
+    level, each one in its own process, and cancels the rest as soon as one
+    of them solves it.
+
+    Args:
+        config (dict): Portfolio configuration:
+            - level (int): Level number, shared by every strategy.
+            - strategies (list of dict): run_game configurations without the
+              level, e.g. {"algorithm": "astar", "heuristics": ["hungarian"]}.
+            - policy (str): "first" (default) returns the first solution found;
+              "optimal" skips every strategy that may not be step-optimal (see
+              optimality_problem), so the first solution is an optimal one.
+            - timeout (float): seconds before cancelling every strategy (optional).
+            - record (str): CSV file where the winner of each run is appended (optional).
+            Any other key (e.g. "deadlock_patterns") is shared by every strategy.
+
+    Returns:
+        tuple: (winning strategy or None, solution, elapsed seconds)
+    """
+    policy = config.get("policy", "first")
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown portfolio policy '{policy}' (expected one of {', '.join(POLICIES)})")
+
+    shared = {key: value for key, value in config.items() if key not in PORTFOLIO_KEYS}
+    strategies = []
+    for strategy in config["strategies"]:
+        problem = optimality_problem(dict(shared, **strategy)) if policy == "optimal" else None
+        if problem is not None:
+            print(f"🔹 Skipping {strategy_name(strategy)}: {problem}")
+        else:
+            strategies.append(strategy)
+    if not strategies:
+        print("No strategy to run")
+        return None, None, 0.0
+
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_run_strategy, args=(index, dict(shared, **strategy), results))
+                 for index, strategy in enumerate(strategies)]
+    start_time = time.time()
+    for process in processes:
+        process.start()
+
+    winner = None
+    solution = None
+    pending = set(range(len(strategies)))
+    timeout = config.get("timeout")
+    try:
+        while pending:
+            if timeout is not None and time.time() - start_time > timeout:
+                print(f"🔹 Timeout after {timeout} seconds")
+                break
+            try:
+                index, found, expanded_nodes, frontier_size, processing_time, error = results.get(timeout=0.1)
+            except queue.Empty:
+                # A strategy that died without reporting (e.g. out of memory) is not waited for
+                for index in list(pending):
+                    if not processes[index].is_alive() and processes[index].exitcode != 0:
+                        print(f"🔹 {strategy_name(strategies[index])}: exited with code {processes[index].exitcode}")
+                        pending.discard(index)
+                continue
+            pending.discard(index)
+            if error is not None:
+                print(f"🔹 {strategy_name(strategies[index])}: failed\n{error}", end="")
+                continue
+            if found is None:
+                print(f"🔹 {strategy_name(strategies[index])}: no solution")
+                continue
+            winner, solution = index, found
+            print(f"🔹 Winner: {strategy_name(strategies[index])}")
+            print(f"🔹 Solution Length: {len(found)}")
+            print(f"🔹 Nodes Expanded: {expanded_nodes}")
+            print(f"🔹 Nodes in Frontier: {frontier_size}")
+            print(f"🔹 Processing Time: {processing_time:.4f} seconds")
+            break
+    finally:
+        for index in pending:
+            print(f"🔹 Cancelled {strategy_name(strategies[index])}")
+        for process in processes:
+            _cancel(process)
+    elapsed = time.time() - start_time
+
+    if winner is None:
+        print("No strategy found a solution")
+        return None, None, elapsed
+
+    strategy = strategies[winner]
+    if config.get("record"):
+        new_file = not os.path.exists(config["record"])
+        with open(config["record"], "a", newline="") as file:
+            writer = csv.writer(file)
+            if new_file:
+                writer.writerow(["Level", "Policy", "Strategy", "Config", "Solution Length", "Elapsed Time"])
+            writer.writerow([config["level"], policy, strategy_name(strategy), json.dumps(strategy),
+                             len(solution), f"{elapsed:.4f}"])
+    return strategy, solution, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Race several Sokoban strategies and keep the first solution.")
+    parser.add_argument("config_file", type=str, help="Path to the JSON file with the portfolio configuration.")
+    args = parser.parse_args()
+
+    with open(args.config_file, "r") as f:
+        run_portfolio(json.load(f))
@@ -28,7 +28,8 @@ for level, algorithm, heuristics in configurations:
     config = {
         "level": level,
         "algorithm": algorithm,
-        "heuristics": heuristics
+        "heuristics": heuristics,
+        "deadlock_patterns": config_data.get("deadlock_patterns", False)
     }
     print(f"Running with config: {config}")
     solution, expanded_nodes, frontier_size, processing_time = run_game(config, simulate=False)
@@ -0,0 +1,108 @@
+# compact_state.py
+
+from states.sokoban_state import State
+from states.freeze_deadlock import is_freeze_deadlock
+
+# Directions the player can move, in the same order as get_possible_moves
+ACTIONS = ("UP", "DOWN", "LEFT", "RIGHT")
+
+
+class CompactState:
+    """
+    Bit-packed version of State:
+      - player: dense cell id of the player (see LevelData.cell_index)
+      - boxes: a single int used as a bitboard, bit i set <=> box on cell i
+      - zobrist: Zobrist hash (see LevelData.zobrist_hash), updated
+        incrementally by get_possible_moves_compact
+
+    Equality only touches player and boxes. The hash is the Zobrist key:
+    the bitboard itself keeps the box layout in its low bits, which leaves
+    most slots empty in tables indexed by hash % size. player_pos and
+    box_positions are decoded on demand so heuristics keep working unchanged.
+    """
+    __slots__ = ("player", "boxes", "level_data", "zobrist")
+
+    def __init__(self, player, boxes, level_data, zobrist=None):
+        self.player = player
+        self.boxes = boxes
+        self.level_data = level_data
+        if zobrist is None:
+            zobrist = level_data.zobrist_player_ids[player]
+            box_keys = level_data.zobrist_box_ids
+            while boxes:
+                low = boxes & -boxes
+                zobrist ^= box_keys[low.bit_length() - 1]
+                boxes ^= low
+        self.zobrist = zobrist
+
+    @property
+    def player_pos(self):
+        return self.level_data.floor_cells[self.player]
+
+    @property
+    def box_positions(self):
+        return self.level_data.decode_boxes(self.boxes)
+
+    def is_goal(self, level_data):
+        return self.boxes == level_data.goal_mask
+
+    def __eq__(self, other):
+        return self.player == other.player and self.boxes == other.boxes
+
+    def __hash__(self):
+        return self.zobrist
+
+    def __repr__(self):
+        return f"Player: {self.player_pos}, Boxes: {self.box_positions}"
+
+
+def encode_state(state, level_data):
+    """Converts a State into its CompactState equivalent."""
+    return CompactState(level_data.cell_index[state.player_pos],
+                        level_data.encode_boxes(state.box_positions),
+                        level_data)
+
+
+def decode_state(state):
+    """Converts a CompactState back into a regular State."""
+    return State(state.player_pos, state.box_positions)
+
+
+def get_possible_moves_compact(state, level_data):
+    """
+    Same contract as get_possible_moves, but for CompactState:
+    returns a list of (action, new_state) pairs.
+    """
+    possible_moves = []
+    player = state.player
+    boxes = state.boxes
+    move_table = level_data.move_table
+    blocked = boxes | level_data.dead_mask  # cells a box can't be pushed onto
+    player_keys = level_data.zobrist_player_ids
+    box_keys = level_data.zobrist_box_ids
+    zobrist = state.zobrist ^ player_keys[player]
+
+    for action in ACTIONS:
+        step = move_table[action]
+        new_player = step[player]
+        if new_player < 0:
+            continue  # wall
+
+        new_boxes = boxes
+        new_zobrist = zobrist ^ player_keys[new_player]
+        player_bit = 1 << new_player
+        if boxes & player_bit:
+            new_box = step[new_player]
+            # The box would be pushed into a wall, another box or a dead square
+            if new_box < 0 or blocked & (1 << new_box):
+                continue
+            new_boxes = boxes ^ player_bit ^ (1 << new_box)
+            new_zobrist ^= box_keys[new_player] ^ box_keys[new_box]
+            # Freeze check on the pushed box (decoded only for pushes)
+            if is_freeze_deadlock(level_data.floor_cells[new_box],
+                                  set(level_data.decode_boxes(new_boxes)), level_data):
+                continue
+
+        possible_moves.append((action, CompactState(new_player, new_boxes, level_data, new_zobrist)))
+
+    return possible_moves
@@ -0,0 +1,180 @@
+# deadlock_patterns.py
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+from collections import deque
+
+from states.sokoban_state import State
+from states.push_moves import get_push_moves, reachable_cells
+
+# Patterns are stored next to maps/, one file per level (keyed by file hash)
+PATTERNS_DIR = "deadlock_patterns"
+
+
+class DeadlockPatternStore:
+    """
+    Learned deadlock patterns for one level.
+
+    A pattern is a set of box positions that can't all be brought to goals,
+    wherever the player is and whatever the other boxes do. Any state whose
+    boxes contain a pattern is therefore unsolvable.
+
+    Patterns are learned after a push: the pushed box and its closest
+    neighbours (within 'radius', at most 'max_boxes') are solved alone with a
+    small push-level search, from every player region. If that search is
+    exhausted without placing them on goals, the subset is recorded. Proofs
+    that hit 'node_limit' are inconclusive and never recorded.
+
+    Attributes:
+      - patterns: set of frozensets of (x, y)
+      - hits / learned: counters for the current run
+    """
+    def __init__(self, path=None, radius=1, max_boxes=3, node_limit=500):
+        self.path = path
+        self.radius = radius
+        self.max_boxes = max_boxes
+        self.node_limit = node_limit
+        self.patterns = set()
+        self._by_cell = {}    # cell -> patterns that contain it
+        self._checked = {}    # subset -> True if dead, False if alive/unknown
+        self.hits = 0
+        self.learned = 0
+        for pattern in self._read():
+            self.add(pattern)
+
+    @classmethod
+    def for_level(cls, level_file, directory=PATTERNS_DIR, **options):
+        """Store persisted at <directory>/<sha1 of the level file>.json."""
+        with open(level_file, "rb") as file:
+            digest = hashlib.sha1(file.read()).hexdigest()
+        return cls(os.path.join(directory, f"{digest}.json"), **options)
+
+    def add(self, pattern):
+        if pattern in self.patterns:
+            return
+        self.patterns.add(pattern)
+        self._checked[pattern] = True
+        for cell in pattern:
+            self._by_cell.setdefault(cell, []).append(pattern)
+
+    def save(self):
+        """
+        Writes the patterns, merged with the ones saved meanwhile by other
+        processes (e.g. portfolio strategies on the same level). The file is
+        replaced atomically, so a reader never sees it half written, and
+        writers take turns on a lock file so none drops the others' patterns.
+        """
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            for pattern in self._read():
+                self.add(pattern)
+            handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "w") as file:
+                    json.dump(sorted(sorted(pattern) for pattern in self.patterns), file)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+
+    def _read(self):
+        """Patterns saved at self.path (none if the file is missing or unreadable)."""
+        if self.path is None or not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, "r") as file:
+                return [frozenset(tuple(pos) for pos in pattern) for pattern in json.load(file)]
+        except ValueError:
+            return []  #e.g. left truncated by an older version: the patterns are learned again
+
+    def matches(self, boxes, moved_box):
+        """True if some stored pattern containing 'moved_box' is a subset of 'boxes'."""
+        for pattern in self._by_cell.get(moved_box, ()):
+            if pattern <= boxes:
+                self.hits += 1
+                return True
+        return False
+
+    def is_dead(self, boxes, moved_box, level_data):
+        """Matches known patterns first, then tries to learn a new one around 'moved_box'."""
+        if self.matches(boxes, moved_box):
+            return True
+        subset = self._local_subset(boxes, moved_box)
+        dead = self._checked.get(subset)
+        if dead is None:
+            dead = prove_unsolvable(subset, level_data, self.node_limit)
+            self._checked[subset] = dead
+            if dead:
+                self.add(subset)
+                self.learned += 1
+                self.hits += 1
+        return dead
+
+    def wrap(self, actions_fn):
+        """
+        Returns an actions_fn with the same contract that drops every child
+        whose pushed box completes a dead pattern.
+        """
+        def actions_with_patterns(state, level_data):
+            moves = actions_fn(state, level_data)
+            parent_boxes = state.box_positions
+            result = []
+            for action, next_state in moves:
+                next_boxes = next_state.box_positions
+                if next_boxes != parent_boxes:
+                    boxes = set(next_boxes)
+                    moved_box = next(iter(boxes.difference(parent_boxes)))
+                    if self.is_dead(boxes, moved_box, level_data):
+                        continue
+                result.append((action, next_state))
+            return result
+        return actions_with_patterns
+
+    def _local_subset(self, boxes, moved_box):
+        mx, my = moved_box
+        near = [box for box in boxes
+                if box != moved_box and max(abs(box[0] - mx), abs(box[1] - my)) <= self.radius]
+        near.sort(key=lambda box: abs(box[0] - mx) + abs(box[1] - my))
+        return frozenset([moved_box] + near[:self.max_boxes - 1])
+
+
+def prove_unsolvable(boxes, level_data, node_limit):
+    """
+    Push-level BFS with only 'boxes' on the board, started from every player
+    region at once. Returns True only if the search space is exhausted
+    without all the boxes on goals.
+    """
+    if boxes <= level_data.goals:
+        return False
+
+    starts = []
+    seen_cells = set()
+    for cell in level_data.floor_cells:
+        if cell in boxes or cell in seen_cells:
+            continue
+        region = reachable_cells(cell, boxes, level_data)
+        seen_cells |= region
+        player_pos = min(region)
+        starts.append(State(player_pos, boxes, level_data.zobrist_hash(player_pos, boxes)))
+
+    visited = set(starts)
+    frontier = deque(starts)
+    while frontier:
+        if len(visited) > node_limit:
+            return False  # inconclusive
+        state = frontier.popleft()
+        for _, next_state in get_push_moves(state, level_data):
+            if next_state in visited:
+                continue
+            if set(next_state.box_positions) <= level_data.goals:
+                return False
+            visited.add(next_state)
+            frontier.append(next_state)
+    return True
+
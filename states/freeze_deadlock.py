@@ -0,0 +1,66 @@
+# freeze_deadlock.py
+
+def frozen_boxes(box, boxes, level_data):
+    """
+    Freeze analysis for the box that was just pushed.
+
+    A box is frozen when it can't move along either axis. It is blocked on an
+    axis if any of the two neighbours on that axis is:
+      - a wall,
+      - a box that is itself frozen (boxes currently being checked are treated
+        as walls, so mutually blocking boxes such as a 2x2 block are detected),
+    or if both neighbours are dead squares.
+
+    Parameters:
+      - box: (x, y) of the pushed box
+      - boxes: set of all box positions after the push (box included)
+      - level_data: LevelData (walls, goals, deadlocks)
+
+    Returns the set of boxes frozen together with 'box' (empty if 'box' can
+    still move).
+    """
+    group = _is_frozen(box, boxes, level_data, set())
+    return group if group is not None else set()
+
+
+def is_freeze_deadlock(box, boxes, level_data):
+    """True if pushing 'box' froze some box that is not on a goal."""
+    return any(pos not in level_data.goals for pos in frozen_boxes(box, boxes, level_data))
+
+
+def _is_frozen(pos, boxes, level_data, checking):
+    """
+    Returns the group of boxes frozen with 'pos' or None. A neighbour's group
+    only counts if the box relying on it turns out frozen too, since it was
+    computed assuming the boxes in 'checking' never move.
+    """
+    checking.add(pos)
+    group = {pos}
+    result = (_axis_blocked(pos, 1, 0, boxes, level_data, checking, group) and
+              _axis_blocked(pos, 0, 1, boxes, level_data, checking, group))
+    checking.discard(pos)
+    return group if result else None
+
+
+def _axis_blocked(pos, dx, dy, boxes, level_data, checking, group):
+    x, y = pos
+    before = (x - dx, y - dy)
+    after = (x + dx, y + dy)
+    walls = level_data.walls
+
+    # A wall on either side makes it impossible to push along this axis
+    if before in walls or after in walls:
+        return True
+    # Both sides are dead squares: any push along this axis is pointless
+    if before in level_data.deadlocks and after in level_data.deadlocks:
+        return True
+    # A neighbouring box that can't move blocks this axis as well
+    for neighbour in (before, after):
+        if neighbour in checking:
+            return True
+        if neighbour in boxes:
+            neighbour_group = _is_frozen(neighbour, boxes, level_data, checking)
+            if neighbour_group is not None:
+                group |= neighbour_group
+                return True
+    return False
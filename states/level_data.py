@@ -1,12 +1,30 @@
 # level_data.py (just an example filename)
+import random
+from collections import deque
+
+import numpy as np
+
+# Fixed seed so every process (and every run) gets the same Zobrist keys
+ZOBRIST_SEED = 0x50C0BA4
 
 class LevelData:
     """
     Contains static data about the Sokoban level:
       - walls: set/frozenset of (x, y) for walls
       - goals: set/frozenset of (x, y) for goal positions
+      - push_distances: NumPy array [cell id, goal index] with the minimum number
+        of pushes to bring a box from a cell to each goal of goal_list (inf if impossible)
       - deadlocks: frozenset of positions where a box cannot be moved to a goal
-      - manhattan distances: dict for quick distance lookup
+        (dead squares, found by pulling boxes backwards from every goal)
+      - cell_x / cell_y: coordinate arrays indexed by cell id; Manhattan
+        distances are computed in closed form instead of stored per pair
+      - nearest_goal_distances: per cell id, distance to the closest goal
+        (Manhattan or push distance, see set_box_distance)
+      - floor_cells / cell_index: dense ids for every non-wall cell (used by
+        the compact state encoding)
+      - zobrist_box / zobrist_player: random keys per floor cell, used to update
+        state hashes incrementally during successor generation (also as lists
+        indexed by cell id, for the compact state encoding)
     Possibly other attributes like width, height, etc.
     """
     def __init__(self, walls, goals):
@@ -15,9 +33,45 @@ class LevelData:
         self.width = max(x for x, y in walls) + 1
         self.height = max(y for x, y in walls) + 1
 
+        #dense indexing of floor cells (sorted by (x, y) so that decoding a
+        #box bitboard yields the same order as State.box_positions)
+        self.floor_cells = sorted((x, y) for x in range(self.width) for y in range(self.height)
+                                  if (x, y) not in self.walls)
+        self.cell_index = {pos: i for i, pos in enumerate(self.floor_cells)}
+        self.move_table = self._compute_move_table()
+        self.goal_mask = self.encode_boxes(self.goals)
+
+        #Zobrist keys: one random 64-bit int per (cell, box) and per (cell, player)
+        rng = random.Random(ZOBRIST_SEED)
+        self.zobrist_box = {pos: rng.getrandbits(64) for pos in self.floor_cells}
+        self.zobrist_player = {pos: rng.getrandbits(64) for pos in self.floor_cells}
+        self.zobrist_box_ids = [self.zobrist_box[pos] for pos in self.floor_cells]
+        self.zobrist_player_ids = [self.zobrist_player[pos] for pos in self.floor_cells]
+
         #precompute useful data
+        self.goal_list = sorted(self.goals)
+        self.goal_index = {goal: j for j, goal in enumerate(self.goal_list)}
+        self.push_distances = self._compute_push_distances()
+        self._push_distance_rows = self.push_distances.tolist()  # fast scalar lookups
         self.deadlocks = self._compute_deadlocks()
-        self.manhattan_distances = self._precompute_manhattan_distances()
+        self.dead_mask = self.encode_boxes(self.deadlocks)
+        self.cell_x = np.array([x for x, _ in self.floor_cells])
+        self.cell_y = np.array([y for _, y in self.floor_cells])
+        self.manhattan_to_goals = self._compute_manhattan_to_goals()
+        #per cell id flags, used by the vectorized (batch) heuristics
+        self.goal_cells = np.array([pos in self.goals for pos in self.floor_cells], dtype=bool)
+        self.dead_cells = np.array([pos in self.deadlocks for pos in self.floor_cells], dtype=bool)
+
+        #optional LRU memo for box-only heuristic terms (heuristics/box_cache.py)
+        self.box_term_cache = None
+        #optional pattern database for the "pdb" heuristic (heuristics/pattern_database.py)
+        self.pattern_database = None
+        #true when every action is a box push ("moves": "push"): the heuristics then
+        #leave out the player-to-box term, which counts steps, not pushes
+        self.push_moves = False
+
+        #box-to-goal cost source used by the heuristics ("manhattan" or "push")
+        self.set_box_distance("manhattan")
 
     def is_wall(self, x, y):
         return (x, y) in self.walls
@@ -29,58 +83,118 @@ class LevelData:
         return (x, y) in self.deadlocks
 
     def get_manhattan_distance(self, pos1, pos2):
-        return self.manhattan_distances.get((pos1, pos2), float('inf'))
+        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+    def get_nearest_goal_distance(self, box):
+        """Distance from 'box' to its closest goal, using the current box distance source."""
+        return self._nearest_goal_list[self.cell_index[box]]
+
+    def get_push_distance(self, box, goal):
+        return self._push_distance_rows[self.cell_index[box]][self.goal_index[goal]]
+
+    def set_box_distance(self, source):
+        """
+        Selects the box-to-goal cost used by the heuristics through
+        get_box_distance(box, goal): "manhattan" (default) or "push" (true push
+        distances that respect walls, still a lower bound of the real cost).
+        """
+        if source == "push":
+            self.get_box_distance = self.get_push_distance
+            per_goal = self.push_distances
+        elif source == "manhattan":
+            self.get_box_distance = self.get_manhattan_distance
+            per_goal = self.manhattan_to_goals
+        else:
+            raise ValueError(f"Unknown box distance source '{source}'")
+        self.box_distance = source
+        self.box_goal_distances = per_goal  # (cells x goals) array for batch heuristics
+        if self.goal_list:
+            self.nearest_goal_distances = per_goal.min(axis=1)
+        else:
+            self.nearest_goal_distances = np.full(len(self.floor_cells), np.inf)
+        self._nearest_goal_list = self.nearest_goal_distances.tolist()  # fast scalar lookups
+        if self.box_term_cache is not None:
+            self.box_term_cache.clear()  # cached terms used the previous source
+
+    def zobrist_hash(self, player_pos, box_positions):
+        """Full Zobrist hash of a (player, boxes) configuration."""
+        value = self.zobrist_player[player_pos]
+        for pos in box_positions:
+            value ^= self.zobrist_box[pos]
+        return value
+
+    def encode_boxes(self, positions):
+        """Returns the bitboard (a single int) with one bit set per box cell."""
+        mask = 0
+        for pos in positions:
+            mask |= 1 << self.cell_index[pos]
+        return mask
+
+    def decode_boxes(self, mask):
+        """Inverse of encode_boxes: returns the box positions sorted by (x, y)."""
+        positions = []
+        while mask:
+            low_bit = mask & -mask
+            positions.append(self.floor_cells[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return tuple(positions)
 
     
     # --- PRECOMPUTATION FUNCTIONS ---
-    def _compute_deadlocks(self):
+    def _compute_push_distances(self):
         """
-        Find positions where a box can never reach a goal
-        Examples: in a corner that isn't a goal, against two walls with no opening on other side, or in a U-shaped wall (no matter how wide)
+        Minimum number of pushes to bring a box from each floor cell to each goal.
+
+        For every goal, a BFS pulls the box backwards: a box on cell c can be
+        pulled to c + d when both c + d (where the box ends up) and c + 2d
+        (where the player steps back to) are floor. Walls are respected, other
+        boxes and the player's reachability are ignored, so the distances
+        never overestimate the real number of pushes.
         """
-        deadlocks = set()
-
-        for x in range(self.width):
-            for y in range(self.height):
-                if self.is_wall(x, y) or self.is_goal(x, y):
-                    continue  #ignore walls and goals
-
-            ####### CASE 1: Corner Deadlocks #######
-            if ((self.is_wall(x - 1, y) and self.is_wall(x, y - 1)) or
-                (self.is_wall(x + 1, y) and self.is_wall(x, y - 1)) or
-                (self.is_wall(x - 1, y) and self.is_wall(x, y + 1)) or
-                (self.is_wall(x + 1, y) and self.is_wall(x, y + 1))):
-                deadlocks.add((x, y))
-                continue  #skip to next position
-
-            ####### CASE 2: U-Shaped Deadlocks (trapped against a wall between 2 others) #######
-            #check left/right (horizontal U-shape)
-            if (self.is_wall(x - 1, y) and self.is_wall(x + 1, y)):  
-                #check if goal is in this row
-                if not any(self.is_goal(gx, y) for gx in range(self.width)):
-                    deadlocks.add((x, y))
-            
-            #check up/down (vertical U-shape)
-            elif (self.is_wall(x, y - 1) and self.is_wall(x, y + 1)):  
-                #check if goal is in this column
-                if not any(self.is_goal(x, gy) for gy in range(self.height)):
-                    deadlocks.add((x, y))
-
-        return frozenset(deadlocks)
-
-    def _precompute_manhattan_distances(self):
+        distances = np.full((len(self.floor_cells), len(self.goal_list)), np.inf)
+        for j, goal in enumerate(self.goal_list):
+            distances[self.cell_index[goal], j] = 0
+            queue = deque([goal])
+            while queue:
+                x, y = queue.popleft()
+                next_distance = distances[self.cell_index[(x, y)], j] + 1
+                for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+                    box_to = (x + dx, y + dy)
+                    player_to = (x + 2 * dx, y + 2 * dy)
+                    if box_to in self.cell_index and player_to in self.cell_index:
+                        box_id = self.cell_index[box_to]
+                        if distances[box_id, j] == np.inf:
+                            distances[box_id, j] = next_distance
+                            queue.append(box_to)
+        return distances
+
+    def _compute_deadlocks(self):
         """
-        Precompute Manhattan distances for all pairs of (x, y) positions.
-        This speeds up heuristic calculations.
+        Find positions where a box can never reach a goal ("dead squares"):
+        the cells from which no goal can be reached by pushing (see
+        _compute_push_distances, which pulls boxes backwards from every goal).
         """
-        distances = {}
+        if not self.goal_list:
+            return frozenset()
+        unreachable = np.isinf(self.push_distances).all(axis=1)
+        return frozenset(pos for pos, dead in zip(self.floor_cells, unreachable) if dead)
 
-        # Generate all positions explicitly
-        all_positions = [(x, y) for x in range(self.width) for y in range(self.height)]
-
-        # Nested loops instead of product(all_positions, repeat=2)
-        for x1, y1 in all_positions:
-            for x2, y2 in all_positions:
-                distances[((x1, y1), (x2, y2))] = abs(x1 - x2) + abs(y1 - y2)
+    def _compute_move_table(self):
+        """
+        For each direction, a list mapping a cell id to the id of the
+        neighbouring cell in that direction (-1 if it is a wall).
+        """
+        table = {}
+        for action, (dx, dy) in (("UP", (0, -1)), ("DOWN", (0, 1)), ("LEFT", (-1, 0)), ("RIGHT", (1, 0))):
+            table[action] = [self.cell_index.get((x + dx, y + dy), -1) for x, y in self.floor_cells]
+        return table
 
-        return distances
+    def _compute_manhattan_to_goals(self):
+        """
+        Manhattan distance from every floor cell to every goal, as a
+        (cells x goals) array built with broadcasting.
+        """
+        goal_x = np.array([x for x, _ in self.goal_list])
+        goal_y = np.array([y for _, y in self.goal_list])
+        return (np.abs(self.cell_x[:, None] - goal_x[None, :]) +
+                np.abs(self.cell_y[:, None] - goal_y[None, :])).astype(float)
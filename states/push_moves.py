@@ -0,0 +1,133 @@
+# push_moves.py
+from collections import deque
+
+from states.sokoban_state import State, apply_move
+from states.freeze_deadlock import is_freeze_deadlock
+
+# (dx, dy, action) for each direction, same order as get_possible_moves
+DIRECTIONS = [
+    (0, -1, "UP"),
+    (0, 1, "DOWN"),
+    (-1, 0, "LEFT"),
+    (1, 0, "RIGHT")
+]
+
+
+def reachable_cells(player_pos, boxes, level_data):
+    """
+    Flood fill: every cell the player can walk to without pushing a box.
+    'boxes' must support fast membership tests (set/frozenset).
+    """
+    walls = level_data.walls
+    reached = {player_pos}
+    queue = deque([player_pos])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy, _ in DIRECTIONS:
+            nxt = (x + dx, y + dy)
+            if nxt not in reached and nxt not in walls and nxt not in boxes:
+                reached.add(nxt)
+                queue.append(nxt)
+    return reached
+
+
+def normalize_state(state, level_data):
+    """
+    Canonical push-level state: same boxes, with the player moved to the
+    top-left-most cell (min (x, y)) of the region it can currently reach.
+    Two states whose players share a region are then the same node.
+    """
+    region = reachable_cells(state.player_pos, set(state.box_positions), level_data)
+    player_pos = min(region)
+    return State(player_pos, state.box_positions,
+                 level_data.zobrist_hash(player_pos, state.box_positions))
+
+
+def get_push_moves(state, level_data):
+    """
+    Push-level successor generator: instead of single steps, every action is
+    a box push reachable from the player's current region.
+    Returns a list of (action, new_state) pairs where action = (box_pos, direction)
+    and new_state is already normalized (see normalize_state).
+    Use expand_push_solution to turn the pushes back into UP/DOWN/LEFT/RIGHT.
+    """
+    possible_moves = []
+    walls = level_data.walls
+    deadlocks = level_data.deadlocks
+    boxes = set(state.box_positions)
+    region = reachable_cells(state.player_pos, boxes, level_data)
+
+    for box in state.box_positions:
+        bx, by = box
+        for dx, dy, action in DIRECTIONS:
+            # The player must stand behind the box and the cell in front must be free
+            if (bx - dx, by - dy) not in region:
+                continue
+            new_box = (bx + dx, by + dy)
+            if new_box in walls or new_box in boxes or new_box in deadlocks:
+                continue
+
+            new_boxes = boxes - {box}
+            new_boxes.add(new_box)
+            if is_freeze_deadlock(new_box, new_boxes, level_data):
+                continue
+            new_region = reachable_cells(box, new_boxes, level_data)
+            player_pos = min(new_region)
+            zobrist = None
+            if state.zobrist is not None:
+                player_keys = level_data.zobrist_player
+                box_keys = level_data.zobrist_box
+                zobrist = (state.zobrist
+                           ^ player_keys[state.player_pos] ^ player_keys[player_pos]
+                           ^ box_keys[box] ^ box_keys[new_box])
+            possible_moves.append(((box, action), State(player_pos, new_boxes, zobrist)))
+
+    return possible_moves
+
+
+def walk_path(start, target, boxes, level_data):
+    """Shortest list of step actions from start to target avoiding boxes and walls."""
+    walls = level_data.walls
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        if current == target:
+            break
+        x, y = current
+        for dx, dy, action in DIRECTIONS:
+            nxt = (x + dx, y + dy)
+            if nxt not in parents and nxt not in walls and nxt not in boxes:
+                parents[nxt] = (current, action)
+                queue.append(nxt)
+
+    if target not in parents:
+        return None
+    path = []
+    node = target
+    while parents[node] is not None:
+        node, action = parents[node]
+        path.append(action)
+    path.reverse()
+    return path
+
+
+def expand_push_solution(initial_state, pushes, level_data):
+    """
+    Rebuilds the full step-by-step solution (as returned by bfs_search and
+    friends on get_possible_moves) from a list of push actions, walking the
+    player from the real initial position before every push.
+    """
+    offsets = {action: (dx, dy) for dx, dy, action in DIRECTIONS}
+    steps = []
+    state = initial_state
+    for (bx, by), action in pushes:
+        dx, dy = offsets[action]
+        walk = walk_path(state.player_pos, (bx - dx, by - dy), set(state.box_positions), level_data)
+        if walk is None:
+            raise ValueError(f"Push {action} of box {(bx, by)} is not reachable from {state}")
+        for step in walk + [action]:
+            state = apply_move(state, step, level_data)
+        steps.extend(walk)
+        steps.append(action)
+    return steps
@@ -1,14 +1,20 @@
 # state.py
+from states.freeze_deadlock import is_freeze_deadlock
 
 class State:
-    def __init__(self, player_pos, box_positions):
+    def __init__(self, player_pos, box_positions, zobrist=None):
         """
         We no longer store walls/goals in the state.
         They remain in a global or external structure.
+
+        zobrist: optional precomputed Zobrist hash (see LevelData.zobrist_hash).
+        Successors of a state that has one get theirs updated incrementally,
+        so every state of a search shares the same hashing scheme.
         """
         self.player_pos = player_pos  # (x, y)
         # Convert box_positions to a sorted tuple to ensure a canonical order.
         self.box_positions = tuple(sorted(box_positions))
+        self.zobrist = zobrist
 
     def is_goal(self, level_data):
         """
@@ -26,6 +32,8 @@ class State:
 
     def __hash__(self):
         """Hash for BFS/A* expansions."""
+        if self.zobrist is not None:
+            return self.zobrist
         return hash((self.player_pos, self.box_positions))
 
     def __repr__(self):
@@ -52,6 +60,7 @@ def apply_move(state, action, level_data):
 
     # Check if the player is pushing a box
     new_box_positions = set(state.box_positions)
+    pushed = None
     if (new_px, new_py) in state.box_positions:
         # Calculate new box position
         new_bx, new_by = new_px + (new_px - px), new_py + (new_py - py)
@@ -63,8 +72,25 @@ def apply_move(state, action, level_data):
         # Move the box
         new_box_positions.remove((new_px, new_py))
         new_box_positions.add((new_bx, new_by))
+        pushed = ((new_px, new_py), (new_bx, new_by))
+
+    return State((new_px, new_py), new_box_positions,
+                 _child_zobrist(state, (new_px, new_py), pushed, level_data))
+
 
-    return State((new_px, new_py), new_box_positions)
+def _child_zobrist(state, new_player_pos, pushed, level_data):
+    """
+    O(1) Zobrist update: XOR out the old player (and pushed box) cell and
+    XOR in the new one(s). Returns None when the parent has no Zobrist hash.
+    """
+    if state.zobrist is None:
+        return None
+    player_keys = level_data.zobrist_player
+    value = state.zobrist ^ player_keys[state.player_pos] ^ player_keys[new_player_pos]
+    if pushed is not None:
+        box_keys = level_data.zobrist_box
+        value ^= box_keys[pushed[0]] ^ box_keys[pushed[1]]
+    return value
 
 
 def get_possible_moves(state, level_data):
@@ -75,6 +101,13 @@ def get_possible_moves(state, level_data):
     possible_moves = []
     px, py = state.player_pos  # Current player position
 
+    # Incremental Zobrist hashing (only if the parent carries a Zobrist hash)
+    zobrist = state.zobrist
+    if zobrist is not None:
+        player_keys = level_data.zobrist_player
+        box_keys = level_data.zobrist_box
+        zobrist ^= player_keys[(px, py)]
+
     # Directions the player can move: (dx, dy, action)
     directions = [
         (0, -1, "UP"),
@@ -92,19 +125,83 @@ def get_possible_moves(state, level_data):
 
         # If there's a box at the new position, check if it can be pushed
         new_box_positions = set(state.box_positions)
+        child_zobrist = None
+        if zobrist is not None:
+            child_zobrist = zobrist ^ player_keys[(new_px, new_py)]
         if (new_px, new_py) in state.box_positions:
             new_bx, new_by = new_px + dx, new_py + dy  # New box position
 
-            # If the box would be pushed into a wall or another box, skip
-            if (new_bx, new_by) in level_data.walls or (new_bx, new_by) in state.box_positions:
+            # If the box would be pushed into a wall, another box or a dead square, skip
+            if ((new_bx, new_by) in level_data.walls or (new_bx, new_by) in state.box_positions
+                    or (new_bx, new_by) in level_data.deadlocks):
                 continue
 
             # Move the box
             new_box_positions.remove((new_px, new_py))
             new_box_positions.add((new_bx, new_by))
 
+            # The pushed box froze itself (or others) off a goal: drop the child
+            if is_freeze_deadlock((new_bx, new_by), new_box_positions, level_data):
+                continue
+            if zobrist is not None:
+                child_zobrist ^= box_keys[(new_px, new_py)] ^ box_keys[(new_bx, new_by)]
+
         # Create new state (which will automatically sort the box positions)
-        new_state = State((new_px, new_py), new_box_positions)
+        new_state = State((new_px, new_py), new_box_positions, child_zobrist)
         possible_moves.append((action, new_state))
 
-    return possible_moves
\ No newline at end of file
+    return possible_moves
+
+
+def get_possible_pulls(state, level_data):
+    """
+    Reverse moves: every state from which a single forward move leads to
+    'state'. Returns a list of (action, previous_state) pairs, where action
+    is the forward move that takes previous_state to state.
+
+    The player steps back from p to p - d (which must be free floor); if
+    there is a box on p + d it may also be pulled to p (the reverse of
+    pushing it from p to p + d), so both predecessors are generated.
+    Pulling never needs deadlock checks: a backward search only reaches
+    states that can still get to the goal.
+    """
+    possible_pulls = []
+    px, py = state.player_pos
+    boxes = state.box_positions
+
+    zobrist = state.zobrist
+    if zobrist is not None:
+        player_keys = level_data.zobrist_player
+        box_keys = level_data.zobrist_box
+        zobrist ^= player_keys[(px, py)]
+
+    directions = [
+        (0, -1, "UP"),
+        (0, 1, "DOWN"),
+        (-1, 0, "LEFT"),
+        (1, 0, "RIGHT")
+    ]
+
+    for dx, dy, action in directions:
+        back = (px - dx, py - dy)  # where the player stood before moving in 'action'
+        if back in level_data.walls or back in boxes:
+            continue
+        back_zobrist = None
+        if zobrist is not None:
+            back_zobrist = zobrist ^ player_keys[back]
+
+        # Plain step backwards
+        possible_pulls.append((action, State(back, boxes, back_zobrist)))
+
+        # Step backwards pulling the box in front of the player
+        front = (px + dx, py + dy)
+        if front in boxes:
+            new_box_positions = set(boxes)
+            new_box_positions.remove(front)
+            new_box_positions.add((px, py))
+            pull_zobrist = None
+            if zobrist is not None:
+                pull_zobrist = back_zobrist ^ box_keys[front] ^ box_keys[(px, py)]
+            possible_pulls.append((action, State(back, new_box_positions, pull_zobrist)))
+
+    return possible_pulls